@@ -0,0 +1,236 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import print_function, division
+
+""" Frame time benchmarks, run without a window under SDL's dummy video driver.
+
+''' Every scenario drives the game or the menu for a fixed number of frames of 1/35 seconds each,
+''' with scripted input and a seeded random state, and measures how long each frame takes to update
+''' and draw. The percentiles can be saved as a baseline, later runs are compared against it:
+'''
+'''     python bench.py --save          # run everything and save the results as the baseline
+'''     python bench.py                 # run everything and compare with the baseline
+'''     python bench.py words_50 menu   # only run some of the scenarios
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # Has to be set before pygame is initialized by game.py
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import random
+import timeit
+import json
+import time
+import sys
+
+import pygame as pg
+
+import game
+from engine import TypistBot
+
+baselinefile = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "bench_baseline.json")
+
+TIMEPASSED = 1/35.
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_times, p):
+    """ Nearest-rank percentile of an already sorted list """
+    index = max(0, int(round(p / 100. * len(sorted_times))) - 1)
+    return sorted_times[min(index, len(sorted_times)-1)]
+
+def wait_for_background(background, timeout=10):
+    """ Waits until the background loader has drawn the current image """
+    deadline = time.time() + timeout
+    while background.waiting and time.time() < deadline:
+        time.sleep(0.01)
+        background.set_background()
+
+def new_game(screen, seed, words=0):
+    """ A Game with `words` words spread out over the upper part of the screen """
+    random.seed(seed)
+    g = game.Game(screen.get_size(), seed=seed)
+    wait_for_background(g.background)
+
+    rng = random.Random(seed)
+    candidates = sorted(set(w for length in g.state.words.index.lengths() for w in g.state.words.index.bucket(length)))
+    for word in rng.sample(candidates, words):
+        g.state.insert_word(word, rng.randrange(0, g.width - g.state.measure(word)), t=rng.uniform(0, 12))
+    return g
+
+
+def game_scenario(words, typing=False):
+    def run(screen, frames, seed):
+        g = new_game(screen, seed, words)
+        bot = TypistBot(cps=6, seed=seed) if typing else None
+        times = []
+        for frame in range(frames):
+            start = timeit.default_timer()
+            g.update(TIMEPASSED, bot.keystrokes(g.state, TIMEPASSED) if bot else ())
+            g.draw(screen)
+            times.append(timeit.default_timer() - start)
+        g.background.close()
+        return times
+    return run
+
+def swarm_scenario(words):
+    """ A Game in swarm mode with `words` words, with the bot typing """
+    def run(screen, frames, seed):
+        random.seed(seed)
+        g = game.Game(screen.get_size(), seed=seed, swarm=words)
+        wait_for_background(g.background)
+        bot = TypistBot(cps=6, seed=seed)
+        times = []
+        for frame in range(frames):
+            start = timeit.default_timer()
+            g.update(TIMEPASSED, bot.keystrokes(g.state, TIMEPASSED))
+            g.draw(screen)
+            times.append(timeit.default_timer() - start)
+        g.background.close()
+        return times
+    return run
+
+def crossfade_scenario(screen, frames, seed):
+    """ Background crossfades back to back, with a few words on the screen """
+    g = new_game(screen, seed, words=5)
+    background = g.background
+    times = []
+    for frame in range(frames):
+        if not background.fading:
+            # Start the next fade on the next update, once the next image has been loaded
+            next_bg = background.backgrounds[(background.current_bg+1) % len(background.backgrounds)]
+            deadline = time.time() + 10
+            while background.loader.get(next_bg.fname) is None and time.time() < deadline:
+                time.sleep(0.01)
+            background.timer = background.frequency - TIMEPASSED/2
+
+        start = timeit.default_timer()
+        g.update(TIMEPASSED)
+        g.draw(screen)
+        times.append(timeit.default_timer() - start)
+    background.close()
+    return times
+
+def menu_scenario(screen, frames, seed):
+    """ The menu with the focus moving every 10 frames, so the enlarge-font-on-focus effect is running """
+    random.seed(seed)
+    m = game.Menu()
+    menu = m.build_menu(screen)
+    highscoresurf = m.construct_highscoresurf()
+    background = m.contruct_menu_background(screen.get_size())
+    times = []
+    for frame in range(frames):
+        key = (pg.K_DOWN, pg.K_UP)[frame // 40 % 2]
+        events = [pg.event.Event(pg.KEYDOWN, key=key, unicode='', mod=0)] if frame % 10 == 0 else []
+        start = timeit.default_timer()
+        menu.update(events, TIMEPASSED)
+        m.draw(screen, menu, background, highscoresurf)
+        times.append(timeit.default_timer() - start)
+    return times
+
+def menu_background_scenario(screen, frames, seed):
+    """ Building the menu background, which happens every time the menu is opened. Runs frames//10 times """
+    random.seed(seed)
+    m = game.Menu()
+    times = []
+    for i in range(max(frames // 10, 1)):
+        start = timeit.default_timer()
+        m.contruct_menu_background(screen.get_size(), seed=seed+i)
+        times.append(timeit.default_timer() - start)
+    return times
+
+
+scenarios = [
+    ('words_1',         game_scenario(1)),
+    ('words_10',        game_scenario(10)),
+    ('words_50',        game_scenario(50)),
+    ('typing_10',       game_scenario(10, typing=True)),
+    ('swarm_300',       swarm_scenario(300)),
+    ('crossfade',       crossfade_scenario),
+    ('menu',            menu_scenario),
+    ('menu_background', menu_background_scenario),
+]
+
+
+def summarize(times):
+    times = sorted(times)
+    summary = dict(("p{}".format(p), 1000 * percentile(times, p)) for p in PERCENTILES)
+    summary['mean'] = 1000 * sum(times) / len(times)
+    summary['max'] = 1000 * times[-1]
+    summary['frames'] = len(times)
+    return summary
+
+def compare(results, baseline, tolerance):
+    """ Returns the names of the scenarios whose p95 got more than `tolerance` (a fraction) slower """
+    regressions = []
+    for name, summary in results.items():
+        if name in baseline and summary['p95'] > baseline[name]['p95'] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == '__main__':
+    names = [name for name, scenario in scenarios]
+    parser = argparse.ArgumentParser(description="Measure frame times of the game and the menu")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help="scenarios to run, out of {} (default: all)".format(", ".join(names)))
+    parser.add_argument('--frames', type=int, default=300, help="frames per scenario (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=baselinefile, help="baseline file (default: %(default)s)")
+    parser.add_argument('--save', action='store_true', help="save the results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="how much slower p95 may get before it's a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(names)
+    if unknown:
+        parser.error("unknown scenarios: {}".format(", ".join(sorted(unknown))))
+
+    screen = pg.display.set_mode((game.WIDTH, game.HEIGHT))
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except (IOError, ValueError):
+        baseline = {}
+
+    results = {}
+    print("{:<16}{:>9}{:>9}{:>9}{:>9}{:>9}   (ms)".format("scenario", "p50", "p95", "p99", "mean", "max"))
+    for name, scenario in scenarios:
+        if args.scenarios and name not in args.scenarios:
+            continue
+        summary = results[name] = summarize(scenario(screen, args.frames, args.seed))
+        line = "{:<16}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{mean:>9.2f}{max:>9.2f}".format(name, **summary)
+        if name in baseline:
+            line += "   p95 {:+.0f}% vs baseline".format(100 * (summary['p95'] / baseline[name]['p95'] - 1))
+        print(line)
+
+    if args.save:
+        baseline.update(results)
+        directory = os.path.dirname(args.baseline)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=4, sort_keys=True)
+        print("Saved the baseline to {}".format(args.baseline))
+    else:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions (p95 more than {:.0f}% slower): {}".format(100 * args.tolerance, ", ".join(regressions)))
+            sys.exit(1)
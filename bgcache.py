@@ -0,0 +1,122 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+""" On-disk cache of background images that have already been scaled to the size of the game.
+
+''' Every cached image is a file with a small header followed by the raw RGB pixels, which is
+''' memory-mapped and handed to pygame without any decoding. The file name is made from the source
+''' file and the target size, and the header holds the modification time of the source file, so
+''' an entry is thrown away automatically when the source image changes.
+"""
+
+import pygame as pg
+
+import hashlib
+import struct
+import mmap
+import os
+
+cachedir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "backgrounds")
+
+MAGIC = b"MTBG"
+header = struct.Struct("<4sdII") # magic, mtime of the source file, width, height
+
+tobytes = getattr(pg.image, "tobytes", None) or pg.image.tostring # tobytes is called tostring in old pygames
+
+
+def for_display(surf):
+    """ Converts surf to the pixel format of the display if there is one """
+    return surf if pg.display.get_surface() is None else surf.convert()
+
+def decode(fname):
+    """ Loads an image file, making sure it's at least 24 bit so it can be smoothscaled """
+    surf = pg.image.load(fname)
+    if surf.get_bitsize() < 24:
+        rgb = pg.Surface(surf.get_size(), 0, 24)
+        rgb.blit(surf, (0, 0))
+        surf = rgb
+    return surf
+
+def cache_path(fname, size):
+    fname = os.path.abspath(fname)
+    digest = hashlib.sha1(fname.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(cachedir, "{name}.{digest}.{w}x{h}.raw".format(name=os.path.basename(fname),
+                                                                       digest=digest, w=size[0], h=size[1]))
+
+def load(fname, size):
+    """ Returns the cached surface of `fname` scaled to `size`, or None if it isn't cached or is stale """
+    path = cache_path(fname, size)
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError, ValueError): # ValueError is raised for empty files
+        return None
+
+    view = pixels = None
+    try:
+        if len(mapped) < header.size:
+            return None
+        magic, mtime, width, height = header.unpack_from(mapped)
+        if (magic != MAGIC or mtime != os.path.getmtime(fname)
+            or len(mapped) != header.size + width*height*3):
+            return None
+
+        view = memoryview(mapped)[header.size:] # Slicing the mmap itself would copy the pixels
+        pixels = pg.image.frombuffer(view, (width, height), "RGB")
+        return pixels.copy() if pg.display.get_surface() is None else pixels.convert()
+        # ^ The copy (or the conversion) is needed since the surface would otherwise use the mapped memory
+    finally:
+        del pixels, view # The mapped memory can't be closed while they refer to it
+        mapped.close()
+
+def store(fname, size, surf):
+    """ Writes `surf` to the cache as `fname` scaled to `size`. The file is replaced atomically """
+    path = cache_path(fname, size)
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+
+    tmp = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp, "wb") as file:
+        file.write(header.pack(MAGIC, os.path.getmtime(fname), surf.get_width(), surf.get_height()))
+        file.write(tobytes(surf, "RGB"))
+
+    if os.name == "nt" and os.path.exists(path): # os.rename can't replace files on windows
+        os.remove(path)
+    os.rename(tmp, path)
+
+def load_scaled(fname, size, scale):
+    """ Returns `fname` scaled to `size` with scale(surface, size), from the cache if possible.
+    ''' The surface is converted to the pixel format of the display if there is one.
+    """
+    surf = load(fname, size)
+    if surf is None:
+        surf = scale(decode(fname), size)
+        try:
+            store(fname, size, surf)
+        except (IOError, OSError) as e:
+            print("Couldn't cache background {}: {}".format(fname, e))
+        surf = for_display(surf)
+    return surf
+
+def prewarm(fnames, size, scale):
+    """ Makes sure all of `fnames` are cached at `size`, returns the number of images that had to be scaled """
+    scaled = 0
+    for fname in fnames:
+        if load(fname, size) is None:
+            store(fname, size, scale(decode(fname), size))
+            scaled += 1
+    return scaled
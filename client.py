@@ -0,0 +1,178 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+""" Clients for the race server in server.py. Needs Python 3.
+
+''' RaceClient keeps a GameState in sync with a room, from the lines the server sends (see server.py).
+''' The state is never stepped, the words only move and appear and disappear when the server says so,
+''' but keystrokes are pressed on it right away so the prompt doesn't wait for the server.
+'''
+''' Run as a script, it's a load generator: `--clients` headless clients spread over `--rooms` rooms,
+''' each with an engine.TypistBot typing. It reports how late the ticks arrive (their server
+''' timestamps against the local clock, so run it on the same machine as the server) and the traffic:
+'''
+'''     python client.py --clients 300 --rooms 10 --seconds 30
+"""
+
+from array import array
+import argparse
+import asyncio
+import time
+
+from engine import GameState, TypistBot
+
+
+class RaceClient(object):
+    def __init__(self, reader, writer, name):
+        self.reader = reader
+        self.writer = writer
+        self.name = name
+        self.id = None
+        self.state = None # Set once the server has welcomed us
+        self.rate = None
+        self.names = {} # {player: name}
+        self.scores = {} # {player: score}
+        self.over = False
+
+        self.ticks = 0
+        self.received = 0 # Bytes
+        self.sent = 0 # Keystrokes
+        self.lateness = array('d') # Milliseconds from the server sending a tick until it was handled
+
+    @classmethod
+    async def connect(cls, host, port, room, name):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write("JOIN {} {}\n".format(room, name).encode('ascii'))
+        return cls(reader, writer, name)
+
+    def press(self, keystrokes):
+        """ Presses `keystrokes` on the prompt, and sends them to the server """
+        if keystrokes and not self.over:
+            for char in keystrokes:
+                self.state.press(char)
+            self.writer.write((''.join(keystrokes) + "\n").encode('ascii'))
+            self.sent += len(keystrokes)
+
+    def apply(self, line):
+        """ Applies one line from the server to self.state """
+        parts = line.split()
+        kind = parts[0]
+        state = self.state
+        if kind == "T":
+            self.ticks += 1
+            self.lateness.append(1000 * (time.time() - float(parts[2])))
+            state.events = [] # insert_word keeps adding to them, and nothing else clears them
+            for meta in state.current_words.values():
+                meta[1] += 1. / self.rate
+        elif kind == "S":
+            state.insert_word(parts[1], int(parts[2]), float(parts[3]))
+        elif kind == "K":
+            if parts[1] in state.current_words:
+                state.remove_word(parts[1])
+            if int(parts[2]) == self.id:
+                state.matcher.clear()
+        elif kind == "M":
+            if parts[1] in state.current_words:
+                state.remove_word(parts[1])
+        elif kind == "P":
+            self.scores[int(parts[1])] = int(parts[2])
+            if int(parts[1]) == self.id:
+                state.score = int(parts[2])
+        elif kind == "H":
+            state.health = int(parts[1])
+        elif kind == "L":
+            state.level = int(parts[1])
+        elif kind == "J":
+            self.names[int(parts[1])] = parts[2]
+        elif kind == "Q":
+            self.names.pop(int(parts[1]), None)
+        elif kind == "O":
+            self.over = state.over = True
+        elif kind == "WELCOME":
+            self.id, difficulty, self.rate = map(int, parts[1:])
+            self.state = GameState(difficulty)
+        else:
+            raise ValueError("unexpected line from the server: {!r}".format(line))
+
+    async def run(self, on_tick=None):
+        """ Applies what the server sends until the connection is closed. `on_tick` is called with self
+        ''' after every tick has been applied, which is when a bot should type.
+        """
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.received += len(line)
+            line = line.decode('ascii')
+            self.apply(line)
+            if on_tick and line.startswith("T "):
+                on_tick(self)
+        self.writer.close()
+
+
+def percentile(sorted_times, p):
+    """ Nearest-rank percentile of an already sorted list """
+    return sorted_times[min(max(0, int(round(p / 100. * len(sorted_times))) - 1), len(sorted_times)-1)]
+
+async def play(host, port, room, name, cps, seed, clients):
+    client = await RaceClient.connect(host, port, room, name)
+    clients.append(client)
+    bot = TypistBot(cps=cps, seed=seed)
+    await client.run(lambda client: client.press(bot.keystrokes(client.state, 1. / client.rate)))
+
+async def load(args):
+    clients = []
+    tasks = []
+    for i in range(args.clients):
+        tasks.append(asyncio.ensure_future(play(args.host, args.port, "room{}".format(i % args.rooms),
+                                                "bot{}".format(i), args.cps, args.seed + i, clients)))
+        if i % 50 == 49:
+            await asyncio.sleep(0.05) # So the connections don't overflow the listen backlog of the server
+
+    done, pending = await asyncio.wait(tasks, timeout=args.seconds)
+    for task in pending:
+        task.cancel()
+    for task in done:
+        if task.exception() is not None:
+            print("A client failed: {!r}".format(task.exception()))
+    return clients
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run headless bots against a race server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--rooms', type=int, default=10)
+    parser.add_argument('--seconds', type=float, default=30, help="how long to run (default: %(default)s)")
+    parser.add_argument('--cps', type=float, default=5, help="characters per second of every bot (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    clients = asyncio.run(load(args))
+    seconds = time.monotonic() - started
+
+    lateness = sorted(ms for client in clients for ms in client.lateness)
+    kills = sum(client.scores.get(client.id, 0) for client in clients if client.id is not None)
+    print("{} of {} clients connected, {} ticks over {:.0f} s".format(
+        sum(client.id is not None for client in clients), args.clients, sum(client.ticks for client in clients), seconds))
+    print("Received {:.0f} kB/s, sent {:.0f} keystrokes/s, {} characters of words typed".format(
+        sum(client.received for client in clients) / 1000. / seconds, sum(client.sent for client in clients) / seconds, kills))
+    if lateness:
+        print("Tick lateness p50 {:.1f} ms, p95 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms".format(
+            percentile(lateness, 50), percentile(lateness, 95), percentile(lateness, 99), lateness[-1]))
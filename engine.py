@@ -0,0 +1,359 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import print_function, division
+
+""" The rules of the game, without pygame.
+
+''' GameState holds everything about a game that isn't about how it looks, and is moved forward with
+''' GameState.step. game.Game drives it and draws it, but it can just as well run without a display,
+''' much faster than real time:
+'''
+'''     python engine.py --seconds 3600 --cps 6 --accuracy 0.95
+"""
+
+import argparse
+import random
+import string
+import timeit
+import math
+
+import wordindex
+from trie import PrefixMatcher
+
+WIDTH = 1000
+HEIGHT = 700
+
+BACKSPACE = '\x08'
+ALLOWED_CHARS = string.ascii_letters + BACKSPACE
+
+COLOR_INTERVAL = 1/35. # Seconds between each change of the colors of the words
+
+CHAR_WIDTH = 22 # Width of a character of the word font (Anonymous Pro B, 40px) used when nothing else measures text
+
+
+def transform_color(color, changes, max_=255, min_=0, rng=random):
+    """ Return an RGB triplet which has changed slightly from the color taken as input """
+    assert max_ < 256 and min_ >= 0 and max_ >= min_
+    red, green, blue = color
+
+    result = []
+    for color in (red, green, blue):
+        highest = min(color + changes, max_)
+        lowest  = max(color - changes, min_)
+
+        if lowest >= highest:
+            highest = lowest+1
+
+        result.append(rng.randrange(lowest, highest))
+
+    return tuple(result)
+
+
+class GameState(object):
+    """ A game in progress.
+
+    ''' `measure` returns the width in pixels of a text written with the word font, it's used to keep the
+    ''' words and the prompt within the screen. All randomness comes from a Random instance seeded with
+    ''' `seed`, so the same seed and the same steps give the same game.
+    '''
+    ''' With `swarm` set, there are always that many words on the screen, any number of them can start
+    ''' with the same character, and words that reach the bottom don't cost any health. It's for
+    ''' stress testing, with hundreds of words.
+    """
+    def __init__(self, difficulty=0, size=(WIDTH, HEIGHT), measure=None, seed=None, index=None, swarm=0):
+        self.difficulty = difficulty
+        # difficulty will be a number signifying difficulty.
+        # 0 is easy, 1 is medium, 3 is hard. I use this number various places to make it a little more difficult.
+
+        self.width, self.height = self.size = size
+        self.measure = measure or (lambda text: len(text) * CHAR_WIDTH)
+        self.rng = random.Random(seed)
+        self.swarm = swarm
+
+        self.current_words = dict() # Dict that looks like this: {word: [x_position, time_word_has_existed, color]}.
+        """ time_word_has_existed is used to calculate its y position and it's also put into math.cos and
+        ''' added to the x position to make the word move gently from side to side.
+        """
+        self.matcher = PrefixMatcher() # Matches the prompt against the current words
+
+        self.score = 0
+        self.level = 1
+        self.max_health = 5
+        self.health = self.max_health
+        self.words_killed = 0
+        self.over = False
+        self.time = 0
+
+        self.word_frequency = 2.5  # new word every N second
+        self.word_speed = 30 + (self.difficulty*3) # pixels downwards per second
+        self.word_timer = 0
+        self.color_timer = 0 # The colors change at a fixed rate, however long the steps are
+
+        self.events = [] # What happened during the last step, see step
+
+        self.words = wordindex.LevelWords(index or wordindex.index)
+        self.compile_words(self.level)
+
+    @property
+    def prompt_content(self):
+        return self.matcher.prompt
+
+    def press(self, char):
+        """ Handles a keystroke, `char` is one of ALLOWED_CHARS """
+        if char == BACKSPACE:
+            self.matcher.backspace()
+        elif self.measure(self.prompt_content + char) < self.width:
+            # ^ Ensuring the content of the prompt stays approximately within the boundraries of the screen
+            self.matcher.type(char)
+
+    def step(self, timepassed, keystrokes=(), mark=None):
+        """ Moves the game `timepassed` seconds forward, after handling `keystrokes`.
+
+        ''' Returns a list of what happened, as tuples: ('spawn', word), ('kill', word), ('miss', word)
+        ''' and ('level', level). When the player has no health left, self.over is set and nothing
+        ''' more happens. If `mark` is given, it's called with 'words' and 'colors' after the parts of
+        ''' the step that update the words and their colors (see profiler.FrameProfiler.mark).
+        """
+        self.events = []
+        if self.over:
+            return self.events
+
+        for char in keystrokes:
+            self.press(char)
+
+        self.time += timepassed
+
+        old_wt, self.word_timer = self.word_timer, (self.word_timer+timepassed) % self.word_frequency
+        if old_wt > self.word_timer and not self.swarm:
+            self.add_word()
+
+        old_level, self.level = self.level, 1 + self.words_killed//10
+        if self.level > old_level:
+            self.compile_words(self.level)
+
+            self.word_frequency *= 0.99
+            """ Each level, word_frequency becomes 99 percent of itself. If word_frequency starts out at 2.5, then
+            ''' it will become around 2.065 on level 20:
+            '''     for level in range(1, 21): print("Level {:<3}= {:.3f} Seconds".format(level, 2.5 * (0.99 ** (level - 1))))
+            """
+            self.events.append(('level', self.level))
+
+        if self.health <= 0:
+            self.over = True
+            return self.events
+
+        if self.swarm:
+            fill = not self.current_words
+            while len(self.current_words) < self.swarm:
+                if not self.add_swarm_word(fill):
+                    break
+        elif len(self.current_words) < 1:
+            self.add_word()
+            self.word_timer = 0
+
+        for word in self.current_words:
+            self.current_words[word][1] += timepassed
+        if mark:
+            mark('words')
+
+        self.color_timer += timepassed
+        while self.color_timer >= COLOR_INTERVAL:
+            self.color_timer -= COLOR_INTERVAL
+            for word in sorted(self.current_words): # Sorted so the colors only depend on the random state
+                self.current_words[word][2] = transform_color(self.current_words[word][2], 29,
+                                                              max_=240,
+                                                              min_=100,
+                                                              rng=self.rng)
+        if mark:
+            mark('colors')
+
+        for word in sorted(self.current_words): # Sorted so the outcome doesn't depend on the dict order
+            if self.position(word)[1] > self.height:
+                self.remove_word(word)
+                if not self.swarm:
+                    self.health -= 1
+                self.events.append(('miss', word))
+            elif word == self.matcher.completed:
+                self.remove_word(word)
+                self.score += len(word)
+                self.words_killed += 1
+                self.matcher.clear()
+                self.events.append(('kill', word))
+        if mark:
+            mark('words')
+
+        return self.events
+
+    def position(self, word, ahead=0):
+        """ Returns the (x, y) position of the word, `ahead` seconds from now """
+        x, t, color = self.current_words[word]
+        t += ahead
+        """ math.cos is used to make the words move softly and delicately like
+        ''' a leaf traveling in the wind an autum..... no. I don't feel very well, I feel like..
+        ''' like I'm not me anymore, HELP ME PLEASE, IF YOU'RE OUT THERE
+        '''
+        ''' The multipliers on the result are pretty arbitrary, just to make the words move at the
+        ''' right speed.
+        """
+        return x + math.cos(t*3)*8, (t*self.word_speed) + abs(math.cos(t*3)*10)
+
+    def add_word(self):
+        """ Adds a random word whose first character isn't the first character of any of the current words.
+        ''' A free first character is picked first (weighted by how many words start with it, so every
+        ''' allowed word is equally likely), and then a word from that character's bucket.
+        """
+        if not self.free_first_characters:
+            return
+
+        free = sorted(self.free_first_characters) # Sorted so the choice only depends on the random state
+        pick = self.rng.randrange(sum(self.words.first_counts[c] for c in free))
+        for first_character in free:
+            pick -= self.words.first_counts[first_character]
+            if pick < 0:
+                break
+
+        selected = self.words.random_word(first_character, self.rng)
+        self.insert_word(selected, self.rng.randrange(0, self.width-self.measure(selected)))
+
+    def add_swarm_word(self, fill=False):
+        """ Adds a random word that isn't on the screen already, whatever its first character is. It starts
+        ''' a little above the screen, or anywhere on the screen if `fill` is set. Returns False if no word was
+        ''' found that isn't on the screen.
+        """
+        for attempt in range(10):
+            word = self.words[self.rng.randrange(len(self.words))]
+            if word not in self.current_words:
+                break
+        else:
+            return False
+
+        if fill:
+            t = self.rng.uniform(0, self.height / self.word_speed)
+        else:
+            t = -self.rng.uniform(0, 2) # So the new words don't come in as a line
+        self.insert_word(word, self.rng.randrange(0, max(self.width-self.measure(word), 1)), t=t)
+        return True
+
+    def insert_word(self, word, x, t=0, color=(150,150,150)):
+        """ Puts `word` on the screen at `x`, as if it had existed for `t` seconds """
+        self.free_first_characters.discard(word[0])
+        self.current_words[word] = [x, t, color]
+        self.matcher.add(word)
+        self.events.append(('spawn', word))
+
+    def remove_word(self, word):
+        del self.current_words[word]
+        self.matcher.remove(word)
+        if word[0] in self.possible_first_characters:
+            self.free_first_characters.add(word[0])
+
+    def compile_words(self, level):
+        """ Unlocks the word lengths of `level`, only the newly unlocked lengths are read from the index """
+        if self.swarm: # There aren't enough short words for a swarm, so every length is unlocked
+            self.words.unlock(self.words.index.lengths())
+        else:
+            self.words.unlock(range(2, level+3 + self.difficulty))
+        self.possible_first_characters = self.words.first_characters
+        self.free_first_characters = self.possible_first_characters - {word[0] for word in self.current_words}
+
+
+class TypistBot(object):
+    """ A scripted player for GameState.
+
+    ''' It goes for the word closest to the bottom, typing `cps` characters per second after waiting
+    ''' `reaction` seconds for every new word. With probability 1-accuracy a keystroke is a random wrong
+    ''' letter, which it notices and backspaces over.
+    """
+    def __init__(self, cps=5, accuracy=0.97, reaction=0.3, seed=None):
+        self.cps = cps
+        self.accuracy = accuracy
+        self.reaction = reaction
+        self.rng = random.Random(seed)
+
+        self.budget = 0 # Keystrokes the bot has time for
+        self.wait = 0
+        self.target = None
+
+    def keystrokes(self, state, timepassed):
+        """ Returns the keystrokes for the next `timepassed` seconds of `state` """
+        if self.wait > 0:
+            self.wait -= timepassed
+            return []
+
+        self.budget += timepassed * self.cps
+        keys = []
+        while self.budget >= 1:
+            self.budget -= 1
+            key = self.next_key(state, state.prompt_content + ''.join(keys))
+            if key is None:
+                self.budget = 0
+                break
+            keys.append(key)
+            if self.wait > 0:
+                break
+        return keys
+
+    def next_key(self, state, typed):
+        if self.target not in state.current_words or not self.target.startswith(typed):
+            if typed:
+                return BACKSPACE
+
+            if not state.current_words:
+                return None
+            self.target = max(state.current_words, key=lambda word: state.position(word)[1])
+            self.wait = self.reaction
+            return None
+
+        if len(typed) >= len(self.target):
+            return None
+        if self.rng.random() > self.accuracy:
+            return self.rng.choice(string.ascii_lowercase)
+        return self.target[len(typed)]
+
+
+def simulate(state, bot, seconds, timepassed=1/35.):
+    """ Runs `state` with `bot` playing, for `seconds` simulated seconds or until the game is over """
+    while state.time < seconds and not state.over:
+        state.step(timepassed, bot.keystrokes(state, timepassed))
+    return state
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the game without a display, with a bot playing")
+    parser.add_argument('--seconds', type=float, default=600, help="simulated seconds (default: %(default)s)")
+    parser.add_argument('--difficulty', type=int, default=0, choices=(0, 1, 3))
+    parser.add_argument('--step', type=float, default=1/35., help="seconds per step (default: 1/35)")
+    parser.add_argument('--cps', type=float, default=5, help="characters per second typed by the bot")
+    parser.add_argument('--accuracy', type=float, default=0.97)
+    parser.add_argument('--reaction', type=float, default=0.3, help="seconds before the bot starts on a word")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--swarm', type=int, default=0, help="keep this many words on the screen (see GameState)")
+    args = parser.parse_args()
+
+    state = GameState(difficulty=args.difficulty, seed=args.seed, swarm=args.swarm)
+    bot = TypistBot(cps=args.cps, accuracy=args.accuracy, reaction=args.reaction, seed=args.seed)
+
+    start = timeit.default_timer()
+    simulate(state, bot, args.seconds, args.step)
+    elapsed = timeit.default_timer() - start
+
+    print("{outcome} after {time:.1f} simulated seconds: score {score}, level {level}, "
+          "{killed} words killed, health {health}".format(
+              outcome="Game over" if state.over else "Still alive", time=state.time, score=state.score,
+              level=state.level, killed=state.words_killed, health=state.health))
+    print("{:.0f} simulated seconds per second".format(state.time / elapsed if elapsed else float('inf')))
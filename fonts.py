@@ -0,0 +1,148 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pygame as pg
+
+from collections import namedtuple
+import string
+import os
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "resources/font/AnonymousPro-1.002.001/Anonymous Pro B.ttf")
+
+Metrics = namedtuple("Metrics", "height linesize ascent descent")
+
+
+class FontRegistry(object):
+    """ Process-wide registry of loaded fonts, so each face is only read from disk and parsed once.
+
+    ''' Fonts are keyed by (path, size, bold, italic). A path of None is pygame's default font.
+    ''' pg.font has to be initialized before any font is requested.
+    """
+    def __init__(self):
+        self.fonts = {}
+        self.metrics_cache = {}
+        self.atlases = {}
+        self.loads = 0
+        self.lookups = 0
+
+    def get(self, path, size, bold=False, italic=False):
+        self.lookups += 1
+        key = (path, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pg.font.Font(path, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+            self.fonts[key] = font
+            self.loads += 1
+        return font
+
+    def metrics(self, path, size, bold=False, italic=False):
+        """ Returns the vertical metrics of the font as a Metrics namedtuple """
+        key = (path, size, bold, italic)
+        metrics = self.metrics_cache.get(key)
+        if metrics is None:
+            font = self.get(path, size, bold, italic)
+            metrics = self.metrics_cache[key] = Metrics(height=font.get_height(),
+                                                        linesize=font.get_linesize(),
+                                                        ascent=font.get_ascent(),
+                                                        descent=font.get_descent())
+        return metrics
+
+    def atlas(self, path, size):
+        """ Returns the GlyphAtlas of the font, the font has to be monospaced """
+        key = (path, size)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = GlyphAtlas(self.get(path, size))
+        return atlas
+
+    def __len__(self):
+        """ The number of font objects that are resident """
+        return len(self.fonts)
+
+    def stats(self):
+        return "{resident} fonts resident, {loads} loaded from disk in {lookups} lookups".format(
+            resident=len(self), loads=self.loads, lookups=self.lookups)
+
+
+class GlyphAtlas(object):
+    """ The characters of a monospaced font, each rendered once per color, so texts can be put together by
+    ''' blitting them instead of having FreeType render every text.
+
+    ''' A glyph is drawn `advance` pixels after the one before it, moved left by how far it reaches left of
+    ''' its cell (minx in font.metrics), and the whole text is moved right by how far the first glyph
+    ''' reaches left. That gives the same pixels as font.render. The glyphs are rendered the first time
+    ''' they're needed in a color, so the colors should be from a small set (like quantized colors).
+    ''' Texts with characters that aren't in `chars` are rendered by the font.
+    """
+    def __init__(self, font, chars=string.ascii_letters):
+        self.font = font
+        self.chars = frozenset(chars)
+        self.advance = font.metrics('M')[0][4]
+        self.height = font.get_height()
+        self.offsets = dict((char, min(0, font.metrics(char)[0][0])) for char in chars)
+        self.rights = dict((char, self.offsets[char] + font.size(char)[0]) for char in chars)
+        self.heights = dict((char, font.size(char)[1]) for char in chars)
+        assert max(self.rights.values()) - min(self.rights.values()) < self.advance, "not a monospaced font"
+        # ^ So the last glyph of a text is always the one that reaches furthest right
+        self.glyphs = {} # {color: {char: surface}}
+        self.rendered = 0
+
+    def fits(self, text):
+        return self.chars.issuperset(text)
+
+    def size(self, text):
+        """ Like font.size """
+        if not text or not self.fits(text):
+            return self.font.size(text)
+        width = -self.offsets[text[0]] + (len(text)-1)*self.advance + self.rights[text[-1]]
+        return width, max(map(self.heights.__getitem__, text))
+
+    def glyph(self, char, color):
+        glyphs = self.glyphs.get(color)
+        if glyphs is None:
+            glyphs = self.glyphs[color] = {}
+        surf = glyphs.get(char)
+        if surf is None:
+            surf = glyphs[char] = self.font.render(char, True, color)
+            self.rendered += 1
+        return surf
+
+    def blit(self, dest, text, color, pos):
+        """ Draws `text` on `dest`, with the top left corner of what font.render would give at `pos` """
+        color = tuple(color)
+        x, y = pos
+        if not self.fits(text):
+            dest.blit(self.font.render(text, True, color), pos)
+            return
+        if text:
+            x -= self.offsets[text[0]]
+        glyphs = [(self.glyph(char, color), (x + i*self.advance + self.offsets[char], y))
+                  for i, char in enumerate(text)]
+        if hasattr(dest, 'blits'):
+            dest.blits(glyphs, 0)
+        else: # pygame older than 1.9.4
+            for glyph, position in glyphs:
+                dest.blit(glyph, position)
+
+
+registry = FontRegistry()
+
+def get_font(height, path=FONT_PATH):
+    return registry.get(path, height)
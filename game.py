@@ -21,41 +21,54 @@ from __future__ import print_function
 import pygame as pg
 from pygame import Rect, Surface
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict, defaultdict, deque
 import random
 import glob
 import re
 import json
-import string
 import webbrowser
-import math
+import argparse
+import threading
+import timeit
 import os
 
+try:
+    import queue
+except ImportError: # Python 2
+    import Queue as queue
+
+try:
+    import numpy
+    import pygame.surfarray
+except ImportError: # The menu background is drawn line by line without it
+    numpy = None
+
 import kezmenu
 
+import bgcache
+from fonts import get_font, registry as font_registry, FONT_PATH
 from scores import load_score, write_score
-from words import words
+from engine import GameState, transform_color, ALLOWED_CHARS
+from profiler import FrameProfiler, KeyLatency, nothing
+from replay import Recorder, Replay
 
 pg.init()
 
 WIDTH = 1000
 HEIGHT = 700
 
-BACKSPACE = '\x08'
-
-def get_font(height):
-    return pg.font.Font(os.path.join(os.path.dirname(__file__),
-                                     "resources/font/AnonymousPro-1.002.001/Anonymous Pro B.ttf"),
-                        height)
-
 def endswith_any(s, *suffixes):
     return any(s.endswith(suffix) for suffix in suffixes)
 
-def renderpair(text, val, font, width, textcolor=pg.Color("darkblue"), background=False, bgcolor=(0,0,0,195)):
-    text = font.render(text, True, textcolor)
-    val = font.render(str(val), True, textcolor)
+def renderpair(text, val, font, width, textcolor=pg.Color("darkblue"), background=False, bgcolor=(0,0,0,195),
+               pool=None):
+    """ If `pool` (a SurfacePool) is given, the surface is taken from it, and the caller should give it back """
+    render = pool.render if pool else lambda font, text, antialias, color: font.render(text, antialias, color)
+    text = render(font, text, True, textcolor)
+    val = render(font, str(val), True, textcolor)
 
-    surf = Surface((text.get_rect().width + width, text.get_rect().height),  pg.SRCALPHA, 32)
+    size = (text.get_rect().width + width, text.get_rect().height)
+    surf = pool.get(size, pg.SRCALPHA) if pool else Surface(size, pg.SRCALPHA, 32)
     if background:
         surf.fill(bgcolor)
 
@@ -79,42 +92,303 @@ def stretch(surf, size):
         
     return surf
 
+def color_walk(start, steps, changes, max_=255, min_=0, seed=None):
+    """ Returns a (steps, 3) numpy array of RGB colors, each a little different from the one before it,
+    ''' starting from `start`. It looks like calling transform_color over and over (both drift towards
+    ''' `min_`), but the numbers aren't the same: it draws from numpy's random state, and it stops at `min_`
+    ''' with a running maximum, so all the steps are computed at once, while the colors are only cut off
+    ''' at `max_` afterwards since they seldom get there.
+    """
+    rng = numpy.random.RandomState(seed)
+    walk = numpy.array(start) + numpy.cumsum(rng.randint(-changes, changes, size=(steps, 3)), axis=0)
+    walk += numpy.maximum(numpy.maximum.accumulate(min_ - walk, axis=0), 0)
+    return numpy.minimum(walk, max_ - 1)
+
+
+class SurfacePool(object):
+    """ Surfaces that are given back when they aren't needed anymore, to be used again instead of making new ones.
+
+    ''' They're kept by size and whether they have per-pixel alpha, at most `keep` of each. self.allocations
+    ''' counts the surfaces made (including rendered text, see render) since the last call to frame, and
+    ''' self.history has the counts of the last `history` frames.
+    """
+    def __init__(self, keep=16, history=35):
+        self.keep = keep
+        self.free = defaultdict(list) # {(size, flags): [surface, ...]}
+        self.allocations = 0
+        self.history = deque(maxlen=history)
+
+        self.made = 0
+        self.reused = 0
+
+    def get(self, size, flags=0, fill=(0, 0, 0, 0)):
+        """ Returns a surface of `size` filled with `fill`, (transparent) black by default. `flags` is 0 or
+        ''' pg.SRCALPHA.
+        """
+        free = self.free.get((tuple(size), flags))
+        if free:
+            self.reused += 1
+            surf = free.pop()
+        else:
+            self.allocations += 1
+            surf = Surface(size, flags, 32) if flags else Surface(size)
+        surf.fill(fill)
+        return surf
 
-def transform_color(color, changes, max_=255, min_=0):
-    """ Return an RGB triplet which has changed slightly from the color taken as input """
-    assert max_ < 256 and min_ >= 0 and max_ >= min_
-    red, green, blue = color
+    def put(self, surf):
+        """ Gives `surf` back, it mustn't be used after this """
+        free = self.free[(surf.get_size(), surf.get_flags() & pg.SRCALPHA)]
+        if len(free) < self.keep:
+            free.append(surf)
+
+    def render(self, font, text, antialias, color):
+        """ font.render, counted as an allocation """
+        self.allocations += 1
+        return font.render(text, antialias, color)
+
+    def frame(self):
+        """ Called at the end of every frame """
+        self.history.append(self.allocations)
+        self.made += self.allocations
+        self.allocations = 0
+
+    def average(self):
+        """ Allocations per frame over the last frames """
+        return float(sum(self.history)) / len(self.history) if self.history else 0.0
+
+    def stats(self):
+        return "{made} surfaces made, {reused} reused".format(made=self.made, reused=self.reused)
+
+
+class WordSurfCache(object):
+    """ LRU cache for the composed surfaces of the falling words.
+
+    ''' Keys are (word, length of the typed prefix, quantized color). The colors of the words change
+    ''' slightly every frame (see transform_color), so they're quantized into buckets of `color_step`,
+    ''' otherwise nothing would ever be found in the cache. A word keeps its bucket while its color stays
+    ''' near it, so a color wandering around the edge of a bucket doesn't make the word render again and again.
+    """
+    def __init__(self, maxsize=512, color_step=48, pool=None):
+        self.maxsize = maxsize
+        self.color_step = color_step
+        self.pool = pool # Evicted surfaces are given back to it
+
+        self.surfs = OrderedDict() # {(word, typed, color): surface}, least recently used first
+        self.keys_by_word = defaultdict(set) # {word: set of keys in self.surfs}, used by discard
+        self.buckets = {} # {word: the quantized color it was last drawn with}
+
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, color, word=None):
+        step = self.color_step
+        bucket = self.buckets.get(word)
+        if bucket is not None and all(abs(c - (b + step//2)) < step for c, b in zip(color, bucket)):
+            return bucket
+        bucket = tuple(c - c % step for c in color)
+        if word is not None:
+            self.buckets[word] = bucket
+        return bucket
+
+    def get(self, key):
+        """ Returns the cached surface, or None if it isn't there """
+        surf = self.surfs.pop(key, None)
+        if surf is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.surfs[key] = surf # Move it to the most recently used end
+        return surf
 
-    result = []
-    for color in (red, green, blue):
-        highest = min(color + changes, max_)
-        lowest  = max(color - changes, min_)
+    def put(self, key, surf):
+        self.surfs[key] = surf
+        self.keys_by_word[key[0]].add(key)
+
+        while len(self.surfs) > self.maxsize:
+            old_key, old_surf = self.surfs.popitem(last=False)
+            self.forget_key(old_key)
+            if self.pool:
+                self.pool.put(old_surf)
+
+    def discard(self, word):
+        """ Evicts all surfaces of `word`, used when the word dies """
+        self.buckets.pop(word, None)
+        for key in self.keys_by_word.pop(word, ()):
+            surf = self.surfs.pop(key)
+            if self.pool:
+                self.pool.put(surf)
+
+    def forget_key(self, key):
+        keys = self.keys_by_word[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.keys_by_word[key[0]]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return "{hits} hits, {misses} misses ({rate:.1f}% hit rate), {size} surfaces cached".format(
+            hits=self.hits, misses=self.misses, size=len(self.surfs),
+            rate=100. * self.hits / lookups if lookups else 0)
+
+
+class RetainedSurf(object):
+    """ Keeps the surface returned by `render`, and only calls `render` again when the state changes.
+
+    ''' `state` is anything comparable that describes everything the surface depends on. After each
+    ''' call to update, self.changed tells whether the surface was rendered again. If there's a `pool`
+    ''' (a SurfacePool), the old surface is given back to it when there's a new one.
+    """
+    def __init__(self, render, pool=None):
+        self.render = render
+        self.pool = pool
+        self.state = None
+        self.surf = None
+        self.changed = False
+
+    def update(self, state):
+        self.changed = self.surf is None or state != self.state
+        if self.changed:
+            self.state = state
+            if self.pool and self.surf is not None:
+                self.pool.put(self.surf)
+            self.surf = self.render()
+        return self.surf
+
+
+class BackgroundLoader(object):
+    """ Loads and stretches background images on a worker thread.
+
+    ''' At most `maxsize` stretched images are kept in memory, the least recently used
+    ''' one is thrown away when a new one is loaded.
+    """
+    def __init__(self, size, maxsize=3):
+        self.size = size
+        self.maxsize = maxsize
+
+        self.images = OrderedDict() # {fname: surface}, least recently used first
+        self.pending = set() # fnames that have been requested but aren't loaded yet
+        self.failed = set() # fnames that couldn't be loaded, they're never requested again
+        self.lock = threading.Lock()
+
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self.work)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def get(self, fname):
+        """ Returns the image if it's loaded, otherwise the image is requested and None is returned """
+        with self.lock:
+            image = self.images.pop(fname, None)
+            if image is not None:
+                self.images[fname] = image # Move it to the most recently used end
+                return image
+        self.request(fname)
+
+    def request(self, fname):
+        """ Makes sure the image will be loaded (used for prefetching) """
+        with self.lock:
+            if fname in self.images or fname in self.pending or fname in self.failed:
+                return
+            self.pending.add(fname)
+        self.requests.put(fname)
 
-        if lowest >= highest: 
-            highest = lowest+1
-        
-        result.append(random.randrange(lowest, highest))
+    def work(self):
+        while True:
+            fname = self.requests.get()
+            if fname is None:
+                return
 
-    return tuple(result)
+            try:
+                image = bgcache.load_scaled(fname, self.size, stretch)
+            except (pg.error, IOError) as e:
+                print("Couldn't load background {}: {}".format(fname, e))
+                with self.lock:
+                    self.pending.discard(fname)
+                    self.failed.add(fname)
+                continue
+
+            with self.lock:
+                self.pending.discard(fname)
+                self.images[fname] = image
+                while len(self.images) > self.maxsize:
+                    self.images.popitem(last=False)
+
+    def close(self):
+        """ Stops the worker thread once it's done with the requests it has already got """
+        self.requests.put(None)
+
+
+class Crossfade(object):
+    """ Draws the transition from one background image to the next in a fixed number of steps.
+
+    ''' The alpha of the old image is quantized into `steps` levels, and a frame is only drawn when
+    ''' the level changes. The alpha is set on the old image itself while it's blitted, so no copy of
+    ''' it has to be made. The time spent drawing each frame of the transitions is kept in frame_times.
+    """
+    def __init__(self, steps=16):
+        self.steps = steps
+        self.step = None
+        self.fades = 0
+        self.frame_times = []
+
+    def start(self):
+        self.step = None
+        self.fades += 1
+
+    def draw(self, background, old, new, progress):
+        """ Progress goes from 0 (only the old image) to 1 (only the new image).
+        ''' Returns True if anything was drawn.
+        """
+        step = min(int(progress * self.steps), self.steps)
+        if step == self.step:
+            return False
+        self.step = step
+
+        start = timeit.default_timer()
+        background.blit(new)
+        if step < self.steps:
+            old.set_alpha(255 - 255*step//self.steps)
+            background.blit(old)
+            old.set_alpha(None)
+        self.frame_times.append(timeit.default_timer() - start)
+        return True
+
+    def report(self):
+        if not self.frame_times:
+            return "no frames drawn"
+        return "{fades} fades, {frames} frames, {avg:.2f} ms average, {worst:.2f} ms worst".format(
+            fades=self.fades,
+            frames=len(self.frame_times),
+            avg=1000 * sum(self.frame_times) / len(self.frame_times),
+            worst=1000 * max(self.frame_times))
+
+
+def background_files():
+    is_image = lambda fname: endswith_any(fname, '.jpg', '.png')
+    files = glob.glob(os.path.join(os.path.dirname(__file__), "resources/backgrounds/*"))
+    return list(filter(is_image, files))
 
 
 class Background(object):
-    def __init__(self, size):
+    def __init__(self, size, cache_size=3, fade_steps=16):
         width, height = self.size = size
 
         self.surf = Surface(size)
 
         self.backgrounds = [   ]
 
-        is_image = lambda fname: endswith_any(fname, '.jpg', '.png')
-        files = glob.glob(os.path.join(os.path.dirname(__file__), "resources/backgrounds/*"))
-
-        bg = namedtuple("background", "image info")
-        for fname in filter(is_image, files):
+        bg = namedtuple("background", "fname info")
+        for fname in background_files():
             self.backgrounds.append(
-                bg(image = stretch(pg.image.load(fname).convert(), self.size),
+                bg(fname = fname,
                    info  = json.load(open("{}.json".format(fname))))
                 )
+        """ The images are loaded lazily by self.loader, the background isn't drawn until the current
+        ''' image is ready. The next image in the rotation is prefetched, and changing to it is postponed
+        ''' until it has been loaded.
+        """
+        self.loader = BackgroundLoader(size, maxsize=cache_size)
 
         random.shuffle(self.backgrounds)
 
@@ -126,6 +400,10 @@ class Background(object):
         self.fadetime = .7
         self.fading = 0
         self.donefading = True
+        self.crossfade = Crossfade(fade_steps)
+
+        self.changed = True # Set whenever self.surf is redrawn, the game resets it (used for dirty rect rendering)
+        self.waiting = False # True if the current image wasn't loaded when it was supposed to be drawn
 
         self.set_background()
 
@@ -140,31 +418,41 @@ class Background(object):
             self.fading = self.fading-timepassed
 
         if old_timer > self.timer:
-            old_bg, self.current_bg = self.current_bg, (self.current_bg+1) % len(self.backgrounds)
-            if self.current_bg != old_bg:
-                self.fading = self.fadetime
+            next_bg = (self.current_bg+1) % len(self.backgrounds)
+            next_fname = self.backgrounds[next_bg].fname
+            if self.loader.get(next_fname) is None and next_fname not in self.loader.failed:
+                self.timer = old_timer # Not loaded yet, try again next frame
+            else:
+                old_bg, self.current_bg = self.current_bg, next_bg
+                if self.current_bg != old_bg:
+                    self.fading = self.fadetime
+                    self.crossfade.start()
 
         if self.fading:
             self.set_background()
-        elif self.donefading:
+        elif self.donefading or self.waiting:
             self.donefading = False
             self.set_background()
 
     def get_current_bg(self):
         return self.backgrounds[self.current_bg]
 
+    def get_image(self, index):
+        return self.loader.get(self.backgrounds[index].fname)
+
     def set_background(self):
-        if self.fading:
-            old_bg = (self.current_bg-1) % len(self.backgrounds)
-            new = self.get_current_bg().image
-            old = self.backgrounds[old_bg].image.copy()
-            old.set_alpha(self.fading*255/self.fadetime)
+        new = self.get_image(self.current_bg)
+        self.waiting = new is None
+        if self.waiting:
+            return
 
+        self.loader.request(self.backgrounds[(self.current_bg+1) % len(self.backgrounds)].fname)
 
-            self.blit(new)
-            self.blit(old)
+        old = self.get_image((self.current_bg-1) % len(self.backgrounds)) if self.fading else None
+        if old is not None:
+            self.crossfade.draw(self, old, new, 1 - float(self.fading)/self.fadetime)
         else:
-            self.blit(self.get_current_bg().image)
+            self.blit(new)
 
     def browse(self, direction):
         dirs = {'forward':1, 'backward':-1}
@@ -172,13 +460,21 @@ class Background(object):
         self.set_background()
         self.timer = 0
 
+    def close(self):
+        self.loader.close()
+
     def blit(self, surf):
+        self.changed = True
         self.surf.blit(surf, surf.get_rect(centerx=self.surf.get_rect().centerx,
                                            centery=self.surf.get_rect().centery))
 
 
 class Game(object):
-    def __init__(self, size, difficulty=0):
+    phases = ('events', 'words', 'colors', 'background', 'draw_words', 'hud', 'flip', 'wait')
+    # ^ The phases of a frame timed by the profiler
+
+    def __init__(self, size, difficulty=0, dirty_rects=False, seed=None, profile=None, fps=35, logic_rate=120,
+                 latency=None, immediate_input=False, record=None, swarm=0):
         pg.key.set_repeat(250, 30) 
         # ^ Because it's important to be able to hold down the backspace key for clearing the prompt
 
@@ -186,40 +482,73 @@ class Game(object):
         # difficulty will be a number signifying difficulty.
         # 0 is easy, 1 is medium, 3 is hard. I use this number various places to make it a little more difficult.
 
+        self.dirty_rects = dirty_rects
+        """ If dirty_rects is True, only the parts of the screen that have changed are updated with
+        ''' pg.display.update, instead of flipping the whole screen every frame. The whole screen is still
+        ''' redrawn when the background changes (crossfades and browsing), and after pausing.
+        """
+        self.full_redraw = True
+        self.word_rects = [] # Rects of the words drawn in the previous frame
+
+        self.fps = fps # Frames drawn per second at most, 0 means as many as possible
+        self.timestep = 1. / logic_rate
+        self.lag = 0 # Seconds that haven't been simulated yet, always less than self.timestep after update
+        self.max_lag = 0.25
+        """ The game is simulated in fixed steps of self.timestep seconds, no matter how often it's drawn.
+        ''' The words are drawn one step behind, between where they were after the step before the last
+        ''' one and after the last one, self.lag seconds after the former (see draw). After a very slow
+        ''' frame at most self.max_lag seconds are simulated, so it can't snowball.
+        """
+
+        self.profiler = FrameProfiler(self.phases, csvpath=profile) if profile else None
+        self.mark = self.profiler.mark if self.profiler else nothing
+        self.profiler_overlay = None # A RetainedSurf with the overlay, if it's shown (toggled with F3)
+        self.profiler_rect = Rect(10, 0, 0, 0) # Where the overlay was drawn, its top is set in draw
+
+        self.latency = KeyLatency(pg.time.get_ticks)
+        self.latency_csv = latency # The latencies are appended to this file when the game ends, if it's set
+        self.latency_overlay = None # A RetainedSurf with the latency histogram, if it's shown (toggled with F4)
+        self.latency_rect = Rect(size[0]-10, 0, 0, 0)
+        self.immediate_input = immediate_input
+        """ With immediate_input, a frame is drawn as soon as there is input instead of on the next tick
+        ''' of the clock, and the keystrokes are handed to self.state right away instead of with the next step.
+        """
+        self.frame_start = pg.time.get_ticks()
+
         self.width, self.height = self.size = size
         self.surf = Surface(size)
 
         self.prompt_font = get_font(40) # This font it also used for the dangling words, so the name is confusing
         self.prompt_font_height = self.prompt_font.size("Test")[1]
-        self.prompt_content = ''
+        self.atlas = font_registry.atlas(FONT_PATH, 40)
+        # ^ The words and the prompt are put together from the characters of this, instead of rendering them
 
         self.borderwidth = 3 # Used by generate_info_surf and generate_prompt_surf
         self.bgcolor = (40, 40, 40)
         self.bordercolor = pg.Color("orange")
         self.textcolor = pg.Color("white")
 
-        self.current_words = dict() # Dict that looks like this: {word: [x_position, time_word_has_existed, color]}.
-        """ time_word_has_existed is used to calculate its y position and it's also put into math.cos and
-        ''' added to the x position to make the word move gently from side to side.
-        """
-
-        self.score = 0
-        self.level = 1
-        self.max_health = 5
-        self.health = self.max_health
-        self.words_killed = 0
+        self.pool = SurfacePool() # Where the surfaces drawn every frame come from, see draw
+        self.word_surfs = WordSurfCache(maxsize=max(512, swarm*4), pool=self.pool) # Used by create_word_surf
+        # ^ With room for a few times as many surfaces as there are words, the ones drawn in a frame are
+        #   never evicted (and reused) in the same frame
 
-        self.info_surf_height = self.generate_info_surf().get_rect().height
-        self.prompt_surf_height = self.generate_prompt_surf().get_rect().height
+        self.seed = random.getrandbits(32) if seed is None else seed # Picked here so it can be recorded
+        self.state = GameState(difficulty, size, measure=lambda text: self.atlas.size(text)[0], seed=self.seed,
+                               swarm=swarm)
+        # ^ Everything about the game that isn't about how it looks, see engine.py
 
-        self.background_height = (HEIGHT - 
-                                  self.info_surf_height -
-                                  self.prompt_surf_height)
-        self.background = Background((WIDTH, self.background_height))
+        self.recorder = record and Recorder(record, self.seed, difficulty, logic_rate, immediate_input, swarm)
+        # ^ Records what's handed to self.update every frame, see replay.py
 
-        self.allowed_chars = string.ascii_letters + BACKSPACE
+        self.info_bar = RetainedSurf(self.generate_info_surf, self.pool)
+        self.prompt_bar = RetainedSurf(self.generate_prompt_surf, self.pool)
+        self.photo_bar = RetainedSurf(self.generate_photo_surf, self.pool)
 
-        self.compile_words(self.level)
+        self.info_surf_height, self.background_height, self.prompt_surf_height = self.layout(size, self.borderwidth)
+        self.background = Background((WIDTH, self.background_height))
+        self.background_rect = self.background.surf.get_rect(centerx=self.width/2,
+                                                             centery=self.background_height/2 + self.info_surf_height)
 
         self.photo_info_rect = renderpair("Photo:",
                                           """Blabla whatever, this invocation of renderpair is only made to
@@ -228,37 +557,54 @@ class Game(object):
                                           250).get_rect(right=self.width-20,
                                                         bottom=self.height-self.prompt_surf_height-20)
 
-    def main(self, screen):
-        clock = pg.time.Clock()
+    @property
+    def prompt_content(self):
+        return self.state.prompt_content
 
+    @staticmethod
+    def layout(size, borderwidth):
+        """ Returns the heights of the info bar, the background and the prompt bar on a screen of `size`.
+        ''' Doesn't need a Game, so the background cache can be prewarmed without starting one.
+        """
+        info_height = font_registry.metrics(FONT_PATH, 25).height + borderwidth*2 + 10 # See generate_info_surf
+        prompt_height = font_registry.metrics(FONT_PATH, 40).height + borderwidth*2 # See generate_prompt_surf
+        return info_height, size[1] - info_height - prompt_height, prompt_height
 
-        word_frequency = 2.5  # new word every N second
-        word_speed = 30 + (self.difficulty*3) # pixels downwards per second
-        word_timer = 0
+    def main(self, screen):
+        clock = pg.time.Clock()
 
+        keystrokes = [] # Typed characters that haven't been handed to self.state yet
         paused = False
 
         while True:
-            for event in pg.event.get():
+            events = self.wait_for_events() if self.immediate_input and not paused else pg.event.get()
+
+            if self.profiler:
+                self.profiler.begin()
+
+            for event in events:
                 if event.type == pg.QUIT:
                     exit()
-                elif event.type == pg.KEYDOWN and event.unicode in self.allowed_chars and event.unicode != '':
-                    if event.unicode == BACKSPACE:
-                        self.prompt_content = self.prompt_content[:-1]
-                    elif self.prompt_font.size(self.prompt_content + event.unicode)[0] < WIDTH:
-                        # ^ Ensuring the content of the prompt stays approximately within the boundraries of the screen
-                        self.prompt_content += event.unicode
+                elif event.type == pg.KEYDOWN and event.unicode in ALLOWED_CHARS and event.unicode != '':
+                    keystrokes.append(event.unicode)
+                    self.latency.poll(getattr(event, 'timestamp', None))
+                    # ^ pygame doesn't give every event a timestamp, then it's timed from being polled
                 elif event.type == pg.MOUSEBUTTONDOWN and self.photo_info_rect.collidepoint(event.pos):
                     source = self.background.get_current_bg().info['source']
                     print("Attempting to open {url} in webbrowser.".format(url=source))
                     webbrowser.open(source)
+                elif event.type == pg.KEYDOWN and event.key == pg.K_F3 and self.profiler:
+                    self.toggle_profiler_overlay()
+                elif event.type == pg.KEYDOWN and event.key == pg.K_F4:
+                    self.toggle_latency_overlay()
                 elif event.type == pg.KEYDOWN and event.key in (pg.K_RIGHT, pg.K_LEFT):
                     self.background.browse({pg.K_RIGHT: 'forward', pg.K_LEFT: 'backward'}[event.key])
                 elif event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
-                    write_score(self.score)
+                    self.end()
                     return
                 elif event.type == pg.KEYDOWN and event.key == pg.K_RETURN:
                     paused = not paused
+                    self.full_redraw = True
                     if paused:
                         screen.fill((0,0,0))
                         screen.blit(get_font(23).render("Pause (press enter to return (pardon the pun))", 
@@ -266,138 +612,285 @@ class Game(object):
                                     (40,40))
                         pg.display.flip()
 
+            self.mark('events')
+
             if paused:
                 clock.tick(35)
                 continue
 
-            timepassed = clock.tick(35) / 1000.
-
-
-            old_wt, word_timer = word_timer, (word_timer+timepassed) % word_frequency
-            if old_wt > word_timer:
-                self.add_word()
+            ms = clock.tick(0 if self.immediate_input else self.fps)
+            # ^ With immediate_input, wait_for_events has already waited for the next frame
+            self.frame_start = pg.time.get_ticks()
+            self.mark('wait')
 
-            old_level, self.level = self.level, 1 + self.words_killed//10
-            if self.level > old_level:
-                self.compile_words(self.level)
+            if self.recorder:
+                self.recorder.frame(ms, keystrokes)
+            if self.update(ms / 1000., keystrokes):
+                keystrokes = []
 
-                word_frequency *= 0.99
-                """ Each level, word_frequency becomes 99 percent of itself. If word_frequency starts out at 2.5, then
-                ''' it will become around 2.065 on level 20:
-                '''     for level in range(1, 21): print("Level {:<3}= {:.3f} Seconds".format(level, 2.5 * (0.99 ** (level - 1))))
-                """
-
-                print("Word frequency:", word_frequency)
-
-
-            if self.health <= 0:
-                write_score(self.score)
+            if self.state.over:
+                self.end()
                 return
 
-            if len(self.current_words) < 1:
-                self.add_word()
-                word_timer = 0
-
-            for word in self.current_words:
-                self.current_words[word][1] += timepassed
-                self.current_words[word][2] = transform_color(self.current_words[word][2], 29,
-                                                              max_=240,
-                                                              min_=100)
-
-            self.background.update(timepassed)
-            self.surf.blit(self.background.surf,
-                           self.background.surf.get_rect(centerx=screen.get_rect().centerx,
-                                                         centery=self.background_height/2 + self.info_surf_height))
-
-
-            for word, meta in list(self.current_words.items()):
-                """ math.cos is used to make the words move softly and delicately like
-                ''' a leaf traveling in the wind an autum..... no. I don't feel very well, I feel like..
-                ''' like I'm not me anymore, HELP ME PLEASE, IF YOU'RE OUT THERE
-                '''
-                ''' The multipliers on the result are pretty arbitrary, just to make the words move at the
-                ''' right speed.
-                """
-                y = (meta[1]*word_speed) + abs(math.cos(meta[1]*3)*10)
-                if y > HEIGHT:
-                    del self.current_words[word]
-                    self.health -= 1
-                elif word == self.prompt_content:
-                    del self.current_words[word]
-                    self.score += len(word)
-                    self.words_killed += 1
-                    self.prompt_content = ''
-                else:
-                    self.surf.blit(self.create_word_surf(word, meta[2]), (meta[0] + math.cos(meta[1]*3)*8, y))
-
-            self.surf.blit(renderpair("Photo:",
-                                      self.background.get_current_bg().info["photo"],
-                                      get_font(18),
-                                      250,
-                                      textcolor=(0,0,0),
-                                      background=True,
-                                      bgcolor=((25,155,215,108) if self.photo_info_rect.collidepoint(pg.mouse.get_pos())
-                                               else (255,255,215,108))),
-                           self.photo_info_rect)
-
-            self.surf.blit(self.generate_info_surf(), (0,0))
-            prompt_surf = self.generate_prompt_surf()
-            self.surf.blit(prompt_surf, (0, HEIGHT-prompt_surf.get_rect().height))
+            self.draw(screen)
 
+    def replay(self, screen, replay, realtime=True):
+        """ Plays back a recording (a replay.Replay of a game with the same settings as this one), at the
+        ''' recorded speed or as fast as possible. Returns whether it ended like the recording did.
+        """
+        start = pg.time.get_ticks()
+        due = 0 # When the next frame is due, in ms from the start
+        for ms, keystrokes in replay.frames:
+            if self.profiler:
+                self.profiler.begin()
+            for event in pg.event.get():
+                if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                    self.background.close()
+                    if self.profiler:
+                        self.profiler.close()
+                    return False
+
+            if realtime:
+                due += ms
+                pg.time.wait(max(0, due - (pg.time.get_ticks() - start)))
+            self.update(ms / 1000., keystrokes)
+            self.draw(screen)
+            if self.state.over:
+                break
+
+        self.background.close()
+        if self.profiler:
+            self.profiler.close()
+        result = (self.state.score, self.state.health, self.state.words_killed)
+        print("Replayed {} frames in {:.1f} seconds: score {}, health {}, {} words killed".format(
+            len(replay.frames), (pg.time.get_ticks() - start) / 1000., *result))
+        return replay.result is None or result == tuple(replay.result)
+
+    def wait_for_events(self):
+        """ Waits until there are events or it's time for the next frame, and returns the events """
+        timeout = int(1000. / self.fps - (pg.time.get_ticks() - self.frame_start)) if self.fps else 0
+        if timeout <= 0:
+            return pg.event.get()
+        try:
+            event = pg.event.wait(timeout)
+        except TypeError: # pygame 1 can't wait with a timeout
+            pg.time.wait(timeout)
+            return pg.event.get()
+        return ([event] if event.type != pg.NOEVENT else []) + pg.event.get()
+
+    def update(self, timepassed, keystrokes=()):
+        """ Moves the game and the background `timepassed` seconds forward.
+        ''' The keystrokes are handed to the first step (or to self.state right away with immediate_input),
+        ''' returns False if they haven't been handled because no step was taken.
+        """
+        if self.immediate_input and keystrokes:
+            for char in keystrokes:
+                self.state.press(char)
+            keystrokes = ()
+            self.latency.handle()
+
+        self.lag = min(self.lag + timepassed, self.max_lag)
+        handled = not keystrokes
+        while self.lag >= self.timestep and not self.state.over:
+            self.lag -= self.timestep
+            for event, value in self.state.step(self.timestep, () if handled else keystrokes,
+                                                mark=self.profiler and self.mark):
+                if event in ('kill', 'miss'):
+                    self.word_surfs.discard(value)
+                elif event == 'level':
+                    print("Word frequency:", self.state.word_frequency)
+            if not handled:
+                self.latency.handle()
+                handled = True
+        self.mark('words')
+
+        self.background.update(timepassed)
+        self.mark('background')
+        return handled
+
+    def draw(self, screen):
+        """ Draws the current state of the game on `screen`, and updates the display """
+        full_redraw = self.full_redraw or self.background.changed or not self.dirty_rects
+        self.full_redraw = self.background.changed = False
+
+        if full_redraw:
+            self.surf.blit(self.background.surf, self.background_rect)
+        else:
+            for rect in self.word_rects + [self.photo_info_rect, self.profiler_rect, self.latency_rect]:
+                self.restore_background(rect)
+
+        old_word_rects, self.word_rects = self.word_rects, []
+
+        behind = self.lag - self.timestep # Interpolates between the last two steps
+        words = [(self.create_word_surf(word, meta[2]), self.state.position(word, ahead=behind))
+                 for word, meta in self.state.current_words.items()]
+        if hasattr(self.surf, 'blits'):
+            self.word_rects = self.surf.blits(words) # One call for all of them, it matters with --swarm
+        else: # pygame older than 1.9.4
+            self.word_rects = [self.surf.blit(surf, pos) for surf, pos in words]
+        self.mark('draw_words')
+
+        self.surf.blit(self.photo_bar.update((self.background.get_current_bg().info["photo"],
+                                              self.photo_info_rect.collidepoint(pg.mouse.get_pos()))),
+                       self.photo_info_rect)
+
+        # The bars are blitted every frame since words can be drawn on top of them, but they're
+        # only rendered again (and updated on the screen) when what they show has changed.
+        info_surf = self.info_bar.update((self.state.score, self.state.health,
+                                          self.state.words_killed, self.state.level))
+        info_rect = self.surf.blit(info_surf, (0,0))
+        prompt_surf = self.prompt_bar.update((self.prompt_content, self.prompt_is_valid()))
+        prompt_rect = self.surf.blit(prompt_surf, (0, HEIGHT-prompt_surf.get_rect().height))
+
+        old_profiler_rect = self.profiler_rect
+        if self.profiler_overlay:
+            overlay = self.profiler_overlay.update(self.profiler.frames // 10) # Refreshed every 10 frames
+            self.profiler_rect = self.surf.blit(overlay, (10, self.info_surf_height + 10))
+        old_latency_rect = self.latency_rect
+        if self.latency_overlay:
+            overlay = self.latency_overlay.update(len(self.latency))
+            self.latency_rect = self.surf.blit(overlay, overlay.get_rect(right=self.width-10,
+                                                                         top=self.info_surf_height+10))
+        self.mark('hud')
+
+        if full_redraw:
             screen.blit(self.surf, (0, 0))
             pg.display.flip()
+        else:
+            dirty = old_word_rects + self.word_rects + [self.photo_info_rect, old_profiler_rect, self.profiler_rect,
+                                                        old_latency_rect, self.latency_rect]
+            dirty += [rect for rect, bar in ((info_rect, self.info_bar), (prompt_rect, self.prompt_bar))
+                      if bar.changed]
+            for rect in dirty:
+                screen.blit(self.surf, rect, rect)
+            pg.display.update(dirty)
+        self.latency.show()
+        self.pool.frame()
+        self.mark('flip')
+
+    def toggle_profiler_overlay(self):
+        if self.profiler_overlay:
+            self.profiler_overlay = None
+            self.profiler_rect = Rect(self.profiler_rect.topleft, (0, 0))
+        else:
+            self.profiler_overlay = RetainedSurf(self.generate_profiler_surf, self.pool)
+        self.full_redraw = True
+
+    def toggle_latency_overlay(self):
+        if self.latency_overlay:
+            self.latency_overlay = None
+            self.latency_rect = Rect(self.latency_rect.topleft, (0, 0))
+        else:
+            self.latency_overlay = RetainedSurf(self.generate_latency_surf, self.pool)
+        self.full_redraw = True
+
+    def generate_latency_surf(self, font=get_font(16)):
+        """ A histogram of the keystroke latencies so far, see profiler.KeyLatency """
+        counts = self.latency.histogram()
+        bounds = ["<{}".format(bound) for bound in self.latency.buckets] + [">={}".format(self.latency.buckets[-1])]
+        most = max(counts) or 1
+        lines = ["keystroke to display"]
+        lines += ["{:>5} ms {:<20}{:>5}".format(bound, "#" * int(round(20. * count / most)), count)
+                  for bound, count in zip(bounds, counts)]
+        if len(self.latency):
+            lines.append("p50 {:.0f} ms  p95 {:.0f} ms".format(self.latency.percentile(50),
+                                                            self.latency.percentile(95)))
+
+        height = font.get_linesize()
+        surf = self.pool.get((max(font.size(line)[0] for line in lines) + 10, height*len(lines) + 10), pg.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            surf.blit(font.render(line, True, (220, 220, 220)), (5, 5 + i*height))
+        return surf
+
+    def generate_profiler_surf(self, font=get_font(16)):
+        averages = self.profiler.averages()
+        lines = ["{:<11}{:6.2f} ms".format(phase, averages[phase]) for phase in self.phases]
+        lines.append("{:<11}{:6.2f} ms".format("total", sum(averages.values())))
+        lines.append("{:<11}{:6.2f} /frame".format("surfaces", self.pool.average()))
+
+        height = font.get_linesize()
+        surf = self.pool.get((max(font.size(line)[0] for line in lines) + 10, height*len(lines) + 10), pg.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            surf.blit(font.render(line, True, (220, 220, 220)), (5, 5 + i*height))
+        return surf
+
+    def end(self):
+        """ Called when the game is over or the player quits """
+        write_score(self.state.score, self.difficulty)
+        self.background.close()
+        if self.recorder:
+            self.recorder.close(self.state)
+            print("Recorded {} frames to {}".format(self.recorder.frames, self.recorder.path))
+        if self.profiler:
+            self.profiler.close()
+        if self.latency_csv:
+            self.latency.export(self.latency_csv)
+        print("Keystroke latency:", self.latency.summary())
+        print("Word surface cache:", self.word_surfs.stats())
+        print("Surface pool:", self.pool.stats())
+        print("Glyph atlas: {} glyphs rendered".format(self.atlas.rendered))
+        print("Crossfade:", self.background.crossfade.report())
+        print("Font registry:", font_registry.stats())
+
+    def restore_background(self, rect):
+        """ Blits the part of the background that is under `rect` (in self.surf coordinates) onto self.surf """
+        rect = rect.clip(self.background_rect)
+        if rect.width and rect.height:
+            self.surf.blit(self.background.surf, rect, rect.move(-self.background_rect.x, -self.background_rect.y))
 
 
     def create_word_surf(self, word, color):
-        w, h = self.prompt_font.size(word)
+        typed = len(self.prompt_content) if word in self.state.matcher.typed_words() else 0
+        color = self.word_surfs.quantize(color, word)
+
+        key = (word, typed, color)
+        surf = self.word_surfs.get(key)
+        if surf is None:
+            surf = self.render_word_surf(word, typed, color)
+            self.word_surfs.put(key, surf)
+        return surf
+
+    def render_word_surf(self, word, typed, color):
+        """ Renders `word` with the first `typed` characters in black, see create_word_surf """
+        w, h = self.atlas.size(word)
         w += 8
         size = (w, h)
 
-        being_written = len(self.prompt_content) > 0 and word.startswith(self.prompt_content)
-        start = self.prompt_content if being_written else ''
-        end = word[len(self.prompt_content):] if being_written else word
+        start = word[:typed]
+        end = word[typed:]
 
-        start_surf = self.prompt_font.render(start, True, pg.Color("black"))
-        end_surf = self.prompt_font.render(end, True, color)
+        together = self.pool.get(size, pg.SRCALPHA, fill=(50,50,50, 190))
 
-        together = Surface(size, pg.SRCALPHA, 32)
-
-        together.fill((50,50,50, 190))
-
-        together.blit(start_surf, (4, 0))
-        together.blit(end_surf, end_surf.get_rect(right=w-4))
+        self.atlas.blit(together, start, (0, 0, 0), (4, 0))
+        self.atlas.blit(together, end, color, (w-4-self.atlas.size(end)[0], 0))
 
         return together
 
-    def add_word(self):
-        found_word = False
-        while not found_word and len(self.possible_first_characters) > len(self.current_words):
-            selected = random.choice(self.words)
-            if all(not w.startswith(selected[0]) for w in self.current_words.keys()):
-                found_word = True
-                self.current_words[selected] = [random.randrange(0, WIDTH-self.prompt_font.size(selected)[0]), 0,
-                                                (150,150,150)]
-
-    def compile_words(self, level):
-        w = set()
-        for i in range(2, level+3 + self.difficulty):
-            w = w.union(words.get(i, {}))
-        self.words = list(w)
-        self.possible_first_characters = {word[0] for word in self.words}
+    def generate_photo_surf(self, font=get_font(18)):
+        """ The name of the photographer, highlighted when the mouse is over it (click to open the source) """
+        return renderpair("Photo:",
+                          self.background.get_current_bg().info["photo"],
+                          font,
+                          250,
+                          textcolor=(0,0,0),
+                          background=True,
+                          bgcolor=((25,155,215,108) if self.photo_info_rect.collidepoint(pg.mouse.get_pos())
+                                   else (255,255,215,108)),
+                          pool=self.pool)
 
     def generate_info_surf(self, font=get_font(25)):
-
-        infos = list(map(lambda i: renderpair(i[0], i[1], font, 100, textcolor=i[2]),
-                         [ ("Score",  str(self.score),  self.textcolor),
-                           ("Health", str(self.health), (255, 255/self.max_health*self.health, 255/self.max_health*self.health)),
-                           ("Words",  str(self.words_killed), self.textcolor),
-                           ("Level",  str(self.level),  self.textcolor)
+        state = self.state
+        infos = list(map(lambda i: renderpair(i[0], i[1], font, 100, textcolor=i[2], pool=self.pool),
+                         [ ("Score",  str(state.score),  self.textcolor),
+                           ("Health", str(state.health), (255, 255/state.max_health*state.health, 255/state.max_health*state.health)),
+                           ("Words",  str(state.words_killed), self.textcolor),
+                           ("Level",  str(state.level),  self.textcolor)
                       ])) # The color of the health will get increasingly red as the health approaches zero
 
         height = infos[0].get_rect().height + self.borderwidth*2 + 10
-        surf = Surface((WIDTH, height))
-
-        surf.fill(self.bgcolor)
+        surf = self.pool.get((WIDTH, height), fill=self.bgcolor)
 
         gen_borderx = lambda n: (WIDTH/len(infos)) * (1+n)
         gen_centerx = lambda n: gen_borderx(n) - (WIDTH/len(infos)/2)
@@ -405,6 +898,7 @@ class Game(object):
 
         for index, infosurf in enumerate(infos):
             surf.blit(infosurf, infosurf.get_rect(centerx=gen_centerx(index), centery=height/2))
+            self.pool.put(infosurf)
             
             if index+1 < len(infos):
                 borderx = gen_borderx(index)
@@ -414,13 +908,16 @@ class Game(object):
         # ^ borderwidth*2 since it seems like 1/2 of the rect is drawn outside of the surface
         return surf
 
+    def prompt_is_valid(self):
+        """ Whether the content of the prompt is the beginning of any of the current words """
+        return self.state.matcher.valid
+
     def generate_prompt_surf(self):
-        surf = Surface((WIDTH, self.prompt_font_height+self.borderwidth*2))
-        surf.fill(self.bgcolor)
-        color = self.textcolor if any([w.startswith(self.prompt_content) 
-                                       for w in self.current_words]) else pg.Color("red")
-        rendered = self.prompt_font.render(self.prompt_content, True, color)
-        surf.blit(rendered, rendered.get_rect(left=self.borderwidth+4, centery=surf.get_rect().height/2))
+        surf = self.pool.get((WIDTH, self.prompt_font_height+self.borderwidth*2), fill=self.bgcolor)
+        color = self.textcolor if self.prompt_is_valid() else pg.Color("red")
+        rect = Rect((self.borderwidth+4, 0), self.atlas.size(self.prompt_content))
+        rect.centery = surf.get_rect().height/2
+        self.atlas.blit(surf, self.prompt_content, color, rect.topleft)
         pg.draw.rect(surf, self.bordercolor, surf.get_rect(), self.borderwidth*2)
         return surf
 
@@ -428,56 +925,98 @@ class Game(object):
 
 class Menu(object):
     running = True
+    full_redraw = True # Whether the whole screen has to be drawn, instead of just the parts of the menu that changed
+    def __init__(self, **game_options):
+        self.game_options = game_options # Keyword arguments passed on to Game
+
     def main(self, screen):
         clock = pg.time.Clock()
-        menu = kezmenu.KezMenu(
-            ['Play Game (easy)',   lambda: Game(screen.get_size(), difficulty=0).main(screen)],
-            ['Play Game (medium)', lambda: Game(screen.get_size(), difficulty=1).main(screen)],
-            ['Play Game (hard)',   lambda: Game(screen.get_size(), difficulty=3).main(screen)],
-            ['Quit', lambda: setattr(self, 'running', False)],
-        )
-        menu.position = (50, 50)
-        menu.enableEffect('enlarge-font-on-focus', font=None, size=60, enlarge_factor=1.2, enlarge_time=0.3)
-        menu.color = (150,150,150)
-        menu.focus_color = (40, 40, 240)
+        menu = self.build_menu(screen)
 
-        highscoresurf = self.construct_highscoresurf()
+        self.highscoresurf = self.construct_highscoresurf() # Rebuilt by play, there may be a new highscore
         background = self.contruct_menu_background(screen.get_size())
 
         while self.running:
             events = pg.event.get()
             timepassed = clock.tick(30) / 1000.
 
-            if timepassed > 1:
-                highscoresurf = self.construct_highscoresurf()
-
             for event in events:
                 if event.type == pg.QUIT:
                     exit()
 
             menu.update(events, timepassed)
+            self.draw(screen, menu, background, self.highscoresurf)
+
+    def build_menu(self, screen):
+        menu = kezmenu.KezMenu(
+            ['Play Game (easy)',   lambda: self.play(screen, difficulty=0)],
+            ['Play Game (medium)', lambda: self.play(screen, difficulty=1)],
+            ['Play Game (hard)',   lambda: self.play(screen, difficulty=3)],
+            ['Quit', lambda: setattr(self, 'running', False)],
+        )
+        menu.position = (50, 50)
+        menu.enableEffect('enlarge-font-on-focus', font=None, size=60, enlarge_factor=1.2, enlarge_time=0.3)
+        menu.color = (150,150,150)
+        menu.focus_color = (40, 40, 240)
+        return menu
 
+    def play(self, screen, difficulty):
+        Game(screen.get_size(), difficulty=difficulty, **self.game_options).main(screen)
+        self.highscoresurf = self.construct_highscoresurf()
+        self.full_redraw = True
+
+    def draw(self, screen, menu, background, highscoresurf):
+        """ Draws the whole menu the first time and after a game, and only the options that changed otherwise """
+        if self.full_redraw:
             screen.blit(background, (0,0))
             screen.blit(highscoresurf, highscoresurf.get_rect(right=WIDTH-50, bottom=HEIGHT-50))
             menu.draw(screen)
             pg.display.flip()
+            self.full_redraw = False
+        else:
+            pg.display.update(menu.draw(screen, background))
 
-    def contruct_menu_background(self, size):
+    def contruct_menu_background(self, size, seed=None):
+        """ Horizontal and vertical lines of slowly changing colors, on top of each other.
+        ''' Computed all at once with numpy if it's there, line by line otherwise. The two look alike but
+        ''' aren't the same pixels (see color_walk), a seed only gives the same background every time
+        ''' with the same one of them.
+        """
         changes = 5
-        
+        width, height = size
+
+        if numpy is not None:
+            rng = random.Random(seed) # Two walks with different seeds, but still the same for the same seed
+            horizontal = color_walk((100, 100, 100), height, changes, max_=200, min_=30, seed=rng.getrandbits(32))
+            vertical = color_walk((10, 10, 10), width, changes, max_=55, seed=rng.getrandbits(32))
+
+            alpha = 100/255. * 127/255. # The alpha of the vertical lines times the alpha of their surface
+            bg = Surface(size, 0, 32)
+            shifts = bg.get_shifts()[:3]
+            pack = lambda colors: sum(numpy.round(colors[:, i]).astype(numpy.uint32) << shift
+                                      for i, shift in enumerate(shifts))
+            # ^ Packs the colors into pixels, no channel of the sum below goes above 255 so they can be
+            #   blended by adding the packed pixels
+            pixels = pygame.surfarray.pixels2d(bg)
+            numpy.add(pack(vertical * alpha)[:, numpy.newaxis], pack(horizontal * (1-alpha))[numpy.newaxis, :],
+                      out=pixels)
+            del pixels # Unlocks bg
+            return bg
+
+        rng = random.Random(seed)
         bg = Surface(size) # Surface with horizontal lines
         bg2 = Surface(size, pg.SRCALPHA, 32) # Surfave with vertical lines
 
 
         red, green, blue = (100, 100, 100)
-        for y in range(HEIGHT):
-            red, green, blue = transform_color((red, green, blue), changes, max_=200, min_=30)
-            pg.draw.line(bg, (red, green, blue), (0, y), (WIDTH-1, y))
+        for y in range(height):
+            red, green, blue = transform_color((red, green, blue), changes, max_=200, min_=30, rng=rng)
+            pg.draw.line(bg, (red, green, blue), (0, y), (width-1, y))
 
         red, green, blue = (10, 10, 10)
-        for x in range(0, WIDTH):
-            red, green, blue = transform_color((red, green, blue), changes, max_=55)
-            pg.draw.line(bg2, pg.Color(red, green, blue, 100), (x, 0), (x, HEIGHT))
+        for x in range(0, width):
+            red, green, blue = transform_color((red, green, blue), changes, max_=55, rng=rng)
+            pg.draw.line(bg2, pg.Color(red, green, blue, 100), (x, 0), (x, height))
 
 
         bg2.set_alpha(255/2)  # 50% vertical lines, 50% horizontal lines
@@ -486,13 +1025,63 @@ class Menu(object):
         return bg
 
     def construct_highscoresurf(self):
-        font = pg.font.Font(None, 50)
+        font = font_registry.get(None, 50)
         highscore = load_score()
         text = "Highscore: {}".format(highscore)
         return font.render(text, True, (150,150,150))
 
 if __name__ == '__main__':
-    screen = pg.display.set_mode((WIDTH, HEIGHT), pg.DOUBLEBUF)
+    parser = argparse.ArgumentParser(description="MaType, a game where you type falling words")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="only update the parts of the screen that changed (faster on slow hardware)")
+    parser.add_argument('--profile', metavar='CSV',
+                        help="time the phases of every frame and append them to CSV when a game ends "
+                             "(press F3 in the game to show the averages)")
+    parser.add_argument('--latency', metavar='CSV',
+                        help="append the keystroke to display latencies to CSV when a game ends "
+                             "(press F4 in the game to show them)")
+    parser.add_argument('--immediate-input', action='store_true',
+                        help="draw a frame as soon as a key is pressed instead of waiting for the next one")
+    parser.add_argument('--record', metavar='FILE', help="record the games to FILE, each game replaces the last")
+    parser.add_argument('--replay', metavar='FILE', help="play back a recorded game instead of showing the menu")
+    parser.add_argument('--fast', action='store_true', help="play back as fast as possible instead of in real time")
+    parser.add_argument('--swarm', type=int, default=0, metavar='N',
+                        help="stress test: keep N words on the screen, and don't lose health when they're missed")
+    parser.add_argument('--fps', type=int,
+                        help="frames drawn per second, 0 for no limit (default: 35, or 0 with --vsync)")
+    parser.add_argument('--logic-rate', type=int, default=120,
+                        help="steps per second the game is simulated with (default: %(default)s)")
+    parser.add_argument('--vsync', action='store_true', help="wait for vertical sync (needs pygame 2)")
+    parser.add_argument('--prewarm-cache', action='store_true',
+                        help="scale all the backgrounds and store them in the background cache, then exit")
+    args = parser.parse_args()
+
+    if args.prewarm_cache:
+        background_height = Game.layout((WIDTH, HEIGHT), borderwidth=3)[1]
+        scaled = bgcache.prewarm(background_files(), (WIDTH, background_height), stretch)
+        print("Scaled and cached {} backgrounds in {}".format(scaled, bgcache.cachedir))
+        exit()
+
+    screen = None
+    if args.vsync:
+        try:
+            screen = pg.display.set_mode((WIDTH, HEIGHT), pg.SCALED, vsync=1)
+        except (TypeError, AttributeError, pg.error) as e:
+            print("Couldn't turn on vsync:", e)
+    if screen is None:
+        screen = pg.display.set_mode((WIDTH, HEIGHT), pg.DOUBLEBUF)
     screen.set_alpha(None)
     pg.display.set_caption("MaType")
-    Menu().main(screen)
+
+    fps = args.fps if args.fps is not None else (0 if args.vsync else 35)
+
+    if args.replay:
+        recording = Replay(args.replay)
+        matched = Game(screen.get_size(), dirty_rects=args.dirty_rects, profile=args.profile, fps=fps,
+                       **recording.game_options()).replay(screen, recording, realtime=not args.fast)
+        if not matched:
+            print("The replay didn't end like the recording (score, health, words killed: {})".format(
+                tuple(recording.result)))
+        exit(0 if matched else 1)
+    Menu(dirty_rects=args.dirty_rects, profile=args.profile, fps=fps, logic_rate=args.logic_rate,
+         latency=args.latency, immediate_input=args.immediate_input, record=args.record, swarm=args.swarm).main(screen)
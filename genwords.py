@@ -1,23 +1,228 @@
-import sys
+""" Builds the word index (words.idx, see wordindex.py) from one or more dictionary/corpus files.
+
+''' The input is streamed in blocks, and distinct words are sampled by keeping the ones with the lowest
+''' hashes (see DistinctSample), so memory use only depends on the sample size and not on the size of
+''' the input, and a word is as likely to be picked however often it occurs. Optionally every word
+''' length gets its own sample (stratified sampling), and big inputs can be split into chunks sampled
+''' by several processes whose samples are merged afterwards.
+'''
+'''     python genwords.py /usr/share/dict/words
+'''     python genwords.py --per-length 150 --processes 4 --letters-only corpus1.txt corpus2.txt
+"""
+
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import hashlib
 import random
-from string import printable
+import heapq
+import sys
+import os
+import re
+from string import printable, ascii_letters
 from collections import defaultdict
 
-dictfile = sys.argv[1]
+import wordindex
+
+WORD = re.compile(br'\S+')
+WHITESPACE = re.compile(br'\s')
+
+
+class DistinctSample(object):
+    """ A uniform random sample of at most `size` of the distinct words added to it.
+
+    ''' Every word gets a pseudo-random rank from a hash of `key` and the word, and the `size` words with
+    ''' the lowest ranks are kept (a bottom-k sample). A word has the same rank however often it occurs,
+    ''' so frequent words aren't more likely to be picked, and two samples with the same key are merged
+    ''' exactly by keeping the lowest ranks of both.
+    """
+    def __init__(self, size, key):
+        self.size = size
+        self.key = key
+        self.heap = [] # (-rank, word) of the kept words, so the highest rank is on top
+        self.words = set()
+
+    def rank(self, word):
+        return int(hashlib.md5(self.key + word.encode('utf-8')).hexdigest()[:16], 16)
+
+    def add(self, word, rank=None):
+        if word in self.words:
+            return
+        if rank is None:
+            rank = self.rank(word)
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, (-rank, word))
+            self.words.add(word)
+        elif rank < -self.heap[0][0]:
+            dropped = heapq.heapreplace(self.heap, (-rank, word))[1]
+            self.words.discard(dropped)
+            self.words.add(word)
+
+    def merge(self, other):
+        for rank, word in other.heap:
+            self.add(word, -rank)
+
+    @property
+    def items(self):
+        return sorted(self.words)
+
+
+class Sampler(object):
+    """ Either one sample for all words, or one sample per word length if per_length is given """
+    def __init__(self, size, per_length, key):
+        self.size = size
+        self.per_length = per_length
+        self.key = key
+        self.samples = dict() # {length or None: DistinctSample}
+
+    def sample(self, length):
+        if length not in self.samples:
+            self.samples[length] = DistinctSample(self.per_length or self.size, self.key)
+        return self.samples[length]
+
+    def add(self, word):
+        self.sample(len(word) if self.per_length else None).add(word)
+
+    def merge(self, other):
+        for length, sample in other.samples.items():
+            self.sample(length).merge(sample)
+
+    def words(self):
+        return [word for sample in self.samples.values() for word in sample.items]
+
+
+def make_filter(min_length, max_length, letters_only):
+    allowed = set(ascii_letters if letters_only else printable)
+    def accept(word):
+        return min_length <= len(word) <= max_length and all(c in allowed for c in word)
+    return accept
+
+def read_words(fname, start=0, end=None, blocksize=1 << 16, longest=1024):
+    """ Yields the words that begin in the byte range [start, end) of the file.
+    ''' The file is read in blocks of `blocksize` bytes and split on whitespace, so it doesn't matter how
+    ''' long its lines are. Words longer than `longest` bytes are skipped without being kept in memory.
+    """
+    with open(fname, 'rb') as file:
+        file.seek(max(start-1, 0))
+        # ^ Reading starts a byte early, so a word cut by `start` is seen to begin before it and skipped
+        position = file.tell() # Where buffer starts in the file
+        buffer = b''
+        skipping = False # Whether the rest of a too long word is being skipped
+
+        while True:
+            block = file.read(blocksize)
+            buffer += block
+
+            if skipping:
+                space = WHITESPACE.search(buffer)
+                if space is None:
+                    position += len(buffer)
+                    buffer = b''
+                    if not block:
+                        return
+                    continue
+                position += space.start()
+                buffer = buffer[space.start():]
+                skipping = False
+
+            matches = list(WORD.finditer(buffer))
+            pending = matches.pop() if block and matches and matches[-1].end() == len(buffer) else None
+            # ^ The last word may go on in the next block
+            for match in matches:
+                if end is not None and position + match.start() >= end:
+                    return
+                if position + match.start() >= start:
+                    yield match.group().decode('utf-8', 'ignore')
+            if not block:
+                return
+
+            keep = pending.start() if pending else len(buffer)
+            position += keep
+            buffer = buffer[keep:]
+            if len(buffer) > longest:
+                skipping = True
+                position += len(buffer)
+                buffer = b''
+
+def sample_chunk(task):
+    """ Samples the words of one chunk of a file. `task` is a tuple, so it can be sent to Pool.map """
+    fname, start, end, options = task
+    sampler = Sampler(options['size'], options['per_length'], options['key'])
+    accept = make_filter(options['min_length'], options['max_length'], options['letters_only'])
+    for word in read_words(fname, start, end):
+        if accept(word):
+            sampler.add(word)
+    return sampler
+
+def chunks(fname, count):
+    """ Splits the file into `count` byte ranges """
+    size = os.path.getsize(fname)
+    step = max(size // count, 1)
+    starts = list(range(0, size, step))[:count] or [0]
+    return [(start, starts[i+1] if i+1 < len(starts) else None) for i, start in enumerate(starts)]
+
+def build(fnames, size=1300, per_length=None, min_length=1, max_length=float('inf'),
+          letters_only=False, processes=1, seed=None):
+    """ Returns a dict that looks like {word_length: set_of_words}, of `size` distinct words in total, or
+    ''' `per_length` distinct words of every length, or fewer if the input doesn't have that many.
+    """
+    key = str(random.Random(seed).getrandbits(64)).encode('ascii') # The same for every chunk, so they merge
+    options = dict(size=size, per_length=per_length, min_length=min_length,
+                   max_length=max_length, letters_only=letters_only, key=key)
+    tasks = [(fname, start, end, options)
+             for fname in fnames
+             for start, end in chunks(fname, processes)]
+
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        samplers = pool.map(sample_chunk, tasks)
+        pool.close()
+        pool.join()
+    else:
+        samplers = map(sample_chunk, tasks)
 
+    result = Sampler(size, per_length, key)
+    for sampler in samplers:
+        result.merge(sampler)
 
-words = defaultdict(set)
+    words = defaultdict(set)
+    for word in result.words():
+        words[len(word)].add(word)
+    return dict(words)
 
 
-with open(dictfile) as file:
-    wordlist = [w for w in file.read().split()]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the word index from dictionary or corpus files")
+    parser.add_argument('dictfiles', nargs='+', help="files with whitespace separated words")
+    parser.add_argument('--size', type=int, default=1300, help="number of distinct words to pick (default: %(default)s)")
+    parser.add_argument('--per-length', type=int, metavar='N',
+                        help="pick N distinct words of every word length instead of --size words in total")
+    parser.add_argument('--min-length', type=int, default=1)
+    parser.add_argument('--max-length', type=int, default=float('inf'))
+    parser.add_argument('--letters-only', action='store_true',
+                        help="only accept words made of ASCII letters (the only characters the game lets you type)")
+    parser.add_argument('--processes', type=int, default=1, help="split the input between this many processes")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', default=wordindex.indexfile,
+                        help="where to write the index, or a python dict literal if it ends with .py")
+    args = parser.parse_args()
 
-random.shuffle(wordlist)
-wordlist = list(filter(lambda w: all(c in printable for c in w), wordlist))
-wordlist = wordlist[:1300]
+    words = build(args.dictfiles, size=args.size, per_length=args.per_length,
+                  min_length=args.min_length, max_length=args.max_length,
+                  letters_only=args.letters_only, processes=args.processes, seed=args.seed)
 
-for word in wordlist:
-    words[len(word)].add(word)
+    if args.per_length:
+        short = sorted(length for length, ws in words.items() if len(ws) < args.per_length)
+        if short:
+            print("Warning: fewer than {} distinct words of length {}".format(
+                args.per_length, ", ".join(map(str, short))), file=sys.stderr)
+    elif sum(map(len, words.values())) < args.size:
+        print("Warning: only {} distinct words, not {}".format(sum(map(len, words.values())), args.size),
+              file=sys.stderr)
 
-with open("words.py", "w") as file:
-    file.write("words = {}".format(repr(dict(words))))
+    if args.output.endswith(".py"):
+        with open(args.output, "w") as file:
+            file.write("words = {}".format(repr(words)))
+    else:
+        wordindex.write(args.output, words)
@@ -54,6 +54,7 @@ class KezMenu(KezMenuEffectAble):
         self.focus_color = (255, 0, 0, 255)
         self.mouse_enabled = True
         self.mouse_focus = False
+        self._labels = {} # Rendered labels, by (label, font, color)
         # The 2 lines below seem stupid, but for effects I can need different font for every line.
         try:
             self._font = None
@@ -68,18 +69,35 @@ class KezMenu(KezMenuEffectAble):
         for o in self.options:
             text = o['label']
             font = o['font']
-            ren = font.render(text, 1, (0, 0, 0))
-            if ren.get_width() > self.width:
-                self.width = ren.get_width()
+            width = font.size(text)[0]
+            if width > self.width:
+                self.width = width
             self.height+=font.get_height()
 
-    def draw(self, surface):
-        """Blit the menu to a surface."""
+    def _renderLabel(self, text, font, color):
+        """Render a label, or return it from the cache if it has been rendered with the same font and color"""
+        key = (text, font, tuple(color))
+        ren = self._labels.get(key)
+        if ren is None:
+            if len(self._labels) > 256: # Fonts that aren't used anymore would otherwise stay forever
+                self._labels.clear()
+            ren = self._labels[key] = font.render(text, 1, color)
+        return ren
+
+    def draw(self, surface, background=None):
+        """Blit the menu to a surface.
+        Return the rects of the surface that changed since the last call: where the options that look different
+        or have moved were, and where they are now.
+        @background: optional, a surface the size of the surface with what is behind the menu. If given, only the
+                     options that changed are blitted, after the background behind them has been restored.
+        """
         offset = 0
         i = 0
         ol, ot = self.screen_topleft_offset
         first = self.options and self.options[0]
         last = self.options and self.options[-1]
+        dirty = []
+        changed = []
         for o in self.options:
             indent = o.get('padding_col',0)
             
@@ -93,11 +111,17 @@ class KezMenu(KezMenuEffectAble):
             else:
                 clr = self.color
             text = o['label']
-            ren = font.render(text, 1, clr)
+            ren = self._renderLabel(text, font, clr)
             if ren.get_width() > self.width:
                 self.width = ren.get_width()
-            o['label_rect'] = pygame.Rect( (ol+self.x + indent, ot+self.y + offset), (ren.get_width(),ren.get_height()) )
-            surface.blit(ren, (self.x + indent, self.y + offset))
+            rect = pygame.Rect( (self.x + indent, self.y + offset), (ren.get_width(),ren.get_height()) )
+            o['label_rect'] = rect.move(ol, ot)
+            if o.get('drawn') != (ren, rect):
+                if o.get('drawn'):
+                    dirty.append(o['drawn'][1])
+                dirty.append(rect)
+                changed.append(o)
+                o['drawn'] = (ren, rect)
             offset+=font.get_height()
 
             # padding below the line
@@ -106,6 +130,24 @@ class KezMenu(KezMenuEffectAble):
 
             i+=1
 
+        if background is None:
+            changed = self.options
+        else:
+            # Options overlapping the restored background have to be redrawn too, from the background up
+            overlapping = True
+            while overlapping:
+                overlapping = [o for o in self.options if not any(o is c for c in changed)
+                               and o['drawn'][1].collidelist(dirty) != -1]
+                changed += overlapping
+                dirty += [o['drawn'][1] for o in overlapping]
+            for rect in dirty:
+                surface.blit(background, rect, rect)
+            changed = [o for o in self.options if any(o is c for c in changed)]
+        for o in changed:
+            ren, rect = o['drawn']
+            surface.blit(ren, rect)
+        return dirty
+
     def update(self, events, time_passed=None):
         """Update the menu and get input for the menu.
         @events: the pygame catched events
@@ -160,6 +202,7 @@ class KezMenu(KezMenuEffectAble):
 
     def _setFont(self, font):
         self._font = font
+        self._labels.clear()
         for o in self.options:
             o['font'] = font
         self._fixSize()
@@ -52,8 +52,11 @@ class KezMenuEffectAble(object):
         if 'enlarge_factor' not in kwargs:
             kwargs['enlarge_factor'] = 2.
         kwargs['raise_font_ps'] = kwargs['enlarge_factor']/kwargs['enlarge_time'] # pixel-per-second
+        # One font for every size the entries go through while they grow and shrink, shared by all of them
+        kwargs['fonts'] = dict((size, pygame.font.Font(kwargs['font'], size))
+                               for size in range(kwargs['size'], int(kwargs['size']*kwargs['enlarge_factor'])+1))
         for o in self.options:
-            o['font'] = pygame.font.Font(kwargs['font'], kwargs['size'])
+            o['font'] = kwargs['fonts'][kwargs['size']]
             o['font_current_size'] = kwargs['size']
             o['raise_font_factor'] = 1.
 
@@ -79,7 +82,10 @@ class KezMenuEffectAble(object):
 
             new_size = int(data['size'] * o['raise_font_factor'])
             if new_size!=o['font_current_size']:
-                o['font'] = pygame.font.Font(data['font'], new_size)
+                if new_size not in data['fonts']:
+                    # The factor can overshoot a little in a single update
+                    data['fonts'][new_size] = pygame.font.Font(data['font'], new_size)
+                o['font'] = data['fonts'][new_size]
                 o['font_current_size'] = new_size
             i+=1
 
@@ -0,0 +1,170 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_right
+from array import array
+import timeit
+import time
+import csv
+import os
+
+
+def nothing(phase):
+    """ Stands in for FrameProfiler.mark when profiling is off """
+
+
+class FrameProfiler(object):
+    """ Times the phases of every frame.
+
+    ''' begin() starts a frame, and mark(phase) adds the time since the previous begin or mark to
+    ''' `phase`, so a phase can be marked several times in a frame. The times are kept in a ring buffer
+    ''' of `size` frames (one preallocated array per phase), which is appended to the CSV file, if
+    ''' there is one, whenever it fills up and when the profiler is closed. The rows are tagged with
+    ''' when the profiler was created, so the profiles of several games can share a file.
+    """
+    def __init__(self, phases, size=1024, csvpath=None):
+        self.phases = phases
+        self.size = size
+        self.slots = dict((phase, array('d', [0.0]*size)) for phase in phases)
+        self.frames = 0 # Number of frames begun
+        self.flushed = 0 # Number of frames written to the CSV file
+        self.last = None
+
+        self.session = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.csvfile = None
+        if csvpath:
+            new = not os.path.exists(csvpath) or os.path.getsize(csvpath) == 0
+            self.csvfile = open(csvpath, 'a')
+            self.writer = csv.writer(self.csvfile)
+            if new:
+                self.writer.writerow(["session", "frame"] + ["{}_ms".format(phase) for phase in phases])
+
+    def begin(self):
+        if self.frames - self.flushed >= self.size:
+            self.flush()
+
+        slot = self.frames % self.size
+        for times in self.slots.values():
+            times[slot] = 0.0
+        self.frames += 1
+        self.last = timeit.default_timer()
+
+    def mark(self, phase):
+        now = timeit.default_timer()
+        self.slots[phase][(self.frames-1) % self.size] += now - self.last
+        self.last = now
+
+    def averages(self, frames=35):
+        """ Returns {phase: milliseconds} averaged over the last `frames` completed frames """
+        done = list(range(max(self.frames-1-frames, 0, self.frames-self.size), self.frames-1))
+        if not done:
+            return dict((phase, 0.0) for phase in self.phases)
+        return dict((phase, 1000 * sum(times[f % self.size] for f in done) / len(done))
+                    for phase, times in self.slots.items())
+
+    def flush(self):
+        """ Writes the frames that haven't been written yet to the CSV file (or forgets them if there is none) """
+        if self.csvfile:
+            for frame in range(self.flushed, self.frames):
+                slot = frame % self.size
+                self.writer.writerow([self.session, frame] + ["{:.3f}".format(1000 * self.slots[phase][slot])
+                                                              for phase in self.phases])
+        self.flushed = self.frames
+
+    def close(self):
+        self.flush()
+        if self.csvfile:
+            self.csvfile.close()
+            self.csvfile = None
+
+
+class KeyLatency(object):
+    """ Measures how long it takes from a key being pressed until a frame showing it is on the screen.
+
+    ''' Every keystroke goes through three stages, timed in milliseconds of the clock passed in (the
+    ''' clock of the event timestamps, pg.time.get_ticks): 'queue' from the key being pressed until the
+    ''' event is polled, 'input' until the game state has handled it, and 'display' until the display
+    ''' has been updated after that. 'total' is the sum. Keystrokes are handled and shown in the order
+    ''' they were polled. The samples are kept for the whole game, there are few enough of them.
+    """
+    stages = ('queue', 'input', 'display', 'total')
+    buckets = (4, 8, 16, 24, 32, 50, 75, 100, 150) # Upper bounds in ms, the last bucket has none
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.polled = [] # (pressed, polled) of the keystrokes that haven't been handled
+        self.handled = [] # (pressed, polled, handled) of the keystrokes that haven't been shown
+        self.samples = dict((stage, array('d')) for stage in self.stages)
+
+    def __len__(self):
+        return len(self.samples['total'])
+
+    def poll(self, pressed=None):
+        """ Called when a keystroke is polled, `pressed` is the timestamp of the event if it has one """
+        now = self.clock()
+        self.polled.append((now if pressed is None else pressed, now))
+
+    def handle(self):
+        """ Called when the game state has handled all the polled keystrokes """
+        if self.polled:
+            now = self.clock()
+            self.handled.extend(times + (now,) for times in self.polled)
+            self.polled = []
+
+    def show(self):
+        """ Called right after the display has been updated """
+        if not self.handled:
+            return
+        now = self.clock()
+        for pressed, polled, handled in self.handled:
+            self.samples['queue'].append(polled - pressed)
+            self.samples['input'].append(handled - polled)
+            self.samples['display'].append(now - handled)
+            self.samples['total'].append(now - pressed)
+        self.handled = []
+
+    def histogram(self, stage='total'):
+        """ Returns the number of samples of `stage` in each bucket, see self.buckets """
+        counts = [0] * (len(self.buckets) + 1)
+        for ms in self.samples[stage]:
+            counts[bisect_right(self.buckets, ms)] += 1
+        return counts
+
+    def percentile(self, p, stage='total'):
+        """ Nearest-rank percentile in ms, None if there are no samples """
+        times = sorted(self.samples[stage])
+        if not times:
+            return None
+        return times[min(max(0, int(round(p / 100. * len(times))) - 1), len(times)-1)]
+
+    def summary(self):
+        if not len(self):
+            return "no keystrokes shown"
+        return "{} keystrokes, ".format(len(self)) + ", ".join(
+            "{} p50 {:.0f} ms p95 {:.0f} ms".format(stage, self.percentile(50, stage), self.percentile(95, stage))
+            for stage in self.stages)
+
+    def export(self, csvpath):
+        """ Appends one row per keystroke to the CSV file `csvpath`, tagged with when the game ended """
+        new = not os.path.exists(csvpath) or os.path.getsize(csvpath) == 0
+        session = time.strftime("%Y-%m-%d %H:%M:%S")
+        with open(csvpath, 'a') as file:
+            writer = csv.writer(file)
+            if new:
+                writer.writerow(["session", "keystroke"] + ["{}_ms".format(stage) for stage in self.stages])
+            for i in range(len(self)):
+                writer.writerow([session, i] + ["{:.1f}".format(self.samples[stage][i]) for stage in self.stages])
@@ -0,0 +1,123 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+""" Recordings of games, which can be played back exactly as they happened.
+
+''' A game only depends on its seed, its settings and what's handed to Game.update every frame, so
+''' that's all that is recorded:
+'''
+'''     header  "<4sBIBHBH" magic (MTRP), version, seed, difficulty, logic rate, flags (1 = immediate input),
+'''                         swarm size
+'''     frame   "<HH"       milliseconds passed, number of keystrokes, followed by the keystrokes (ASCII)
+'''     end     "<HH"       END and 0, followed by "<iII": the score, health and words killed at the end
+'''
+''' The end record is there to check that a playback ended the same way as the recording.
+"""
+
+import threading
+import struct
+
+try:
+    import queue
+except ImportError: # Python 2
+    import Queue as queue
+
+MAGIC = b"MTRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBIBHBH")
+FRAME = struct.Struct("<HH")
+RESULT = struct.Struct("<iII")
+END = 0xFFFF # Milliseconds of the end record, longer frames are recorded as END-1 ms
+IMMEDIATE_INPUT = 1
+
+
+class Recorder(object):
+    """ Writes a recording of a game to `path`.
+
+    ''' The frames are packed into a buffer, which is handed to a writer thread whenever it's bigger than
+    ''' `buffersize` bytes, so the game never waits for the disk.
+    """
+    def __init__(self, path, seed, difficulty, logic_rate, immediate_input=False, swarm=0, buffersize=4096):
+        self.path = path
+        self.buffersize = buffersize
+        self.buffer = bytearray(HEADER.pack(MAGIC, VERSION, seed, difficulty, logic_rate,
+                                            IMMEDIATE_INPUT if immediate_input else 0, swarm))
+        self.frames = 0
+
+        self.file = open(path, 'wb')
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.work)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def frame(self, ms, keystrokes):
+        """ Records a call of Game.update with `ms` milliseconds and `keystrokes` """
+        keys = ''.join(keystrokes).encode('ascii')
+        self.buffer += FRAME.pack(min(ms, END-1), len(keys)) + keys
+        self.frames += 1
+        if len(self.buffer) >= self.buffersize:
+            self.queue.put(bytes(self.buffer))
+            self.buffer = bytearray()
+
+    def work(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+            self.file.write(data)
+
+    def close(self, state):
+        """ Writes the end record with how `state` ended up, and waits for everything to be written """
+        self.buffer += FRAME.pack(END, 0) + RESULT.pack(state.score, state.health, state.words_killed)
+        self.queue.put(bytes(self.buffer))
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+class Replay(object):
+    """ A recording read from `path`, with the settings of the game as attributes.
+    ''' self.frames is a list of (milliseconds, keystrokes), self.result is (score, health, words killed)
+    ''' from the end record, or None if the recording was cut short.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version = struct.unpack_from("<4sB", data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} isn't a recording this version of the game can play".format(path))
+        magic, version, self.seed, self.difficulty, self.logic_rate, flags, self.swarm = HEADER.unpack_from(data)
+        self.immediate_input = bool(flags & IMMEDIATE_INPUT)
+
+        self.frames = []
+        self.result = None
+        pos = HEADER.size
+        while pos + FRAME.size <= len(data):
+            ms, count = FRAME.unpack_from(data, pos)
+            pos += FRAME.size
+            if ms == END:
+                if pos + RESULT.size <= len(data):
+                    self.result = RESULT.unpack_from(data, pos)
+                break
+            self.frames.append((ms, list(data[pos:pos+count].decode('ascii'))))
+            pos += count
+
+    def game_options(self):
+        """ Keyword arguments for a Game that plays out like the recorded one """
+        return dict(difficulty=self.difficulty, seed=self.seed, logic_rate=self.logic_rate,
+                    immediate_input=self.immediate_input, swarm=self.swarm)
@@ -1,20 +1,141 @@
+""" The scores are kept in an append-only log, `.highscores`, with one line per game:
+
+'''     <score> <difficulty> <timestamp>
+'''
+''' Old files only have the score on each line, those scores count towards the overall highscore but
+''' don't belong to any difficulty. The log is compacted to the top scores of each difficulty when it
+''' grows large. Writes take an exclusive lock on `.highscores.lock`, so several instances of the game
+''' on one machine can share the file (locking is skipped where fcntl isn't available).
+"""
+
+import bisect
+import time
 import os
 
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+
 scorefile = os.path.join(os.path.dirname(__file__), ".highscores")
 
-def load_score():
+
+class ScoreStore(object):
+    """ Keeps the top `keep` scores of every difficulty, and rereads the log only when it has changed """
+    def __init__(self, path, keep=10, compact_factor=4):
+        self.path = path
+        self.lockpath = path + ".lock"
+        self.keep = keep
+        self.compact_factor = compact_factor # The log is compacted when it has this many times as many entries as are kept
+
+        self.reset()
+
+    def reset(self):
+        self.top = dict() # {difficulty: [(-score, -timestamp), ...]}, sorted, so the best score comes first
+        self.best_score = 0
+        self.entries = 0 # Number of entries in the log
+        self.offset = 0 # How far into the log entries have been read
+        self.signature = None # (inode, size, mtime) of the log when it was last read
+
+    def refresh(self):
+        """ Reads whatever has been appended to the log since the last time, or all of it if it was replaced """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self.signature is not None:
+                self.reset()
+            return
+
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime)
+        if signature == self.signature:
+            return
+
+        if self.signature is None or stat.st_ino != self.signature[0] or stat.st_size < self.offset:
+            self.reset()
+
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+
+        complete = data[:data.rfind(b'\n')+1] # A line without a newline is still being written
+        for line in complete.decode('ascii', 'replace').splitlines():
+            self.add_entry(*self.parse(line))
+        self.offset += len(complete)
+        self.signature = signature
+
+    @staticmethod
+    def parse(line):
+        parts = line.split()
+        if not parts or not all(part.isdigit() for part in parts):
+            return None, None, None
+        score = int(parts[0])
+        difficulty = int(parts[1]) if len(parts) > 1 else None
+        timestamp = int(parts[2]) if len(parts) > 2 else 0
+        return score, difficulty, timestamp
+
+    def add_entry(self, score, difficulty, timestamp):
+        if score is None:
+            return
+        self.entries += 1
+        top = self.top.setdefault(difficulty, [])
+        bisect.insort(top, (-score, -timestamp))
+        del top[self.keep:]
+        self.best_score = max(self.best_score, score)
+
+    def best(self, difficulty=None):
+        """ Returns the highest score of `difficulty` (or overall if it's None), or 0 if no one has scored yet """
+        self.refresh()
+        if difficulty is None:
+            return self.best_score
+        top = self.top.get(difficulty)
+        return -top[0][0] if top else 0
+
+    def top_scores(self, difficulty):
+        """ Returns a list of (score, timestamp) tuples, best first """
+        self.refresh()
+        return [(-score, -timestamp) for score, timestamp in self.top.get(difficulty, [])]
+
+    def write(self, score, difficulty=None):
+        assert str(score).isdigit()
+        timestamp = int(time.time())
+        line = "{} {} {}\n".format(score, difficulty, timestamp) if difficulty is not None else "{}\n".format(score)
+
+        with open(self.lockpath, 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.refresh()
+            with open(self.path, 'a') as file:
+                file.write(line)
+            self.refresh()
+
+            if self.entries > self.keep * len(self.top) * self.compact_factor:
+                self.compact()
+            # The lock is released when the lock file is closed
+
+    def compact(self):
+        """ Rewrites the log with only the top scores of every difficulty. Must be called with the lock held """
+        tmp = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(tmp, 'w') as file:
+            for difficulty, top in self.top.items():
+                for score, timestamp in reversed(top):
+                    if difficulty is None:
+                        file.write("{}\n".format(-score))
+                    else:
+                        file.write("{} {} {}\n".format(-score, difficulty, -timestamp))
+
+        if os.name == "nt" and os.path.exists(self.path): # os.rename can't replace files on windows
+            os.remove(self.path)
+        os.rename(tmp, self.path)
+
+        self.reset()
+        self.refresh()
+
+
+store = ScoreStore(scorefile)
+
+def load_score(difficulty=None):
     """ Returns the highest score, or 0 if no one has scored yet """
-    try:
-        with open(scorefile) as file:
-            scores = sorted([int(score.strip())
-                             for score in file.readlines()
-                             if score.strip().isdigit()], reverse=True)
-    except IOError:
-        scores = []
-
-    return scores[0] if scores else 0
-
-def write_score(score):
-    assert str(score).isdigit()
-    with open(scorefile, 'a') as file:
-        file.write("{}\n".format(score))
+    return store.best(difficulty)
+
+def write_score(score, difficulty=None):
+    store.write(score, difficulty)
@@ -0,0 +1,269 @@
+"""
+    Copyright (C) 2013  Mattias Ugelvik <uglemat@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+""" A server for typing races, where everybody in a room types at the same falling words. Needs Python 3.
+
+''' Every room runs one engine.GameState, which spawns the words and moves them, and whoever completes a
+''' word first gets it. The room ticks `rate` times per second and sends what happened during the tick
+''' to all the players at once, encoded once for all of them. The protocol is lines of ASCII text.
+''' A client starts with
+'''
+'''     JOIN <room> <name>
+'''
+''' and after that every line it sends is keystrokes (letters, and \\x08 for backspace). The server sends
+'''
+'''     WELCOME <player> <difficulty> <rate>   once, then the words on the screen as S lines
+'''     T <tick> <unix time>                   every tick, first in the tick, the words have moved 1/rate s
+'''     S <word> <x> <t>                       a word was spawned (t is as in GameState.current_words)
+'''     K <word> <player>                      a player got a word, that player's prompt is cleared
+'''     M <word>                               a word reached the bottom
+'''     P <player> <score>                     a player's score changed
+'''     H <health>                             the room's health changed
+'''     L <level>                              the room reached a new level
+'''     J <player> <name>, Q <player>          a player joined or quit
+'''     O                                      the race is over, the connection is closed after this
+'''
+''' client.py has a client that keeps a GameState in sync with this, and a load generator:
+'''
+'''     python server.py --port 8765
+'''     python client.py --clients 300 --rooms 10 --seconds 30
+"""
+
+import traceback
+import argparse
+import asyncio
+import random
+import time
+
+from engine import GameState, ALLOWED_CHARS, BACKSPACE
+from trie import PrefixMatcher
+
+MAX_PROMPT = 40 # Characters, the prompt of the local game is limited by the width of the screen instead
+MAX_BUFFER = 256 * 1024 # Bytes waiting to be sent to a player before they're dropped for being too slow
+
+
+class Player(object):
+    def __init__(self, id, name, writer):
+        self.id = id
+        self.name = name
+        self.writer = writer
+        self.matcher = PrefixMatcher() # The player's own prompt, matched against the words of the room
+        self.score = 0
+
+
+class Room(object):
+    """ A race. The words of self.state are shared by the players, who each have their own prompt.
+    ''' What happens between two ticks is collected in self.lines and sent to everybody at the next tick.
+    """
+    def __init__(self, name, seed, difficulty=0, rate=35):
+        self.name = name
+        self.rate = rate
+        self.state = GameState(difficulty, seed=seed)
+        self.players = {} # {id: Player}
+        self.next_id = 1
+        self.scores = {} # {name: score}, kept after the players have left
+        self.lines = []
+        self.tick = 0
+
+        self.sent = 0 # Bytes
+        self.keystrokes = 0
+
+    def join(self, name, writer):
+        player = Player(self.next_id, name, writer)
+        self.next_id += 1
+
+        for word in self.state.current_words:
+            player.matcher.add(word)
+        lines = ["WELCOME {} {} {}".format(player.id, self.state.difficulty, self.rate)]
+        lines += ["J {} {}".format(other.id, other.name) for other in self.players.values()]
+        lines += ["P {} {}".format(other.id, other.score) for other in self.players.values()]
+        lines += ["S {} {} {:.3f}".format(word, x, t) for word, (x, t, color) in self.state.current_words.items()]
+        lines += ["H {}".format(self.state.health), "L {}".format(self.state.level)]
+        writer.write(("\n".join(lines) + "\n").encode('ascii'))
+
+        self.players[player.id] = player
+        self.lines.append("J {} {}".format(player.id, name))
+        return player
+
+    def leave(self, player):
+        if self.players.pop(player.id, None) is not None:
+            self.lines.append("Q {}".format(player.id))
+
+    def press(self, player, chars):
+        """ Handles keystrokes of a player, a completed word is the player's right away """
+        for char in chars:
+            if char not in ALLOWED_CHARS:
+                continue
+            self.keystrokes += 1
+            if char == BACKSPACE:
+                player.matcher.backspace()
+            elif len(player.matcher.prompt) < MAX_PROMPT:
+                player.matcher.type(char)
+
+            word = player.matcher.completed
+            if word is not None:
+                self.state.remove_word(word)
+                self.state.words_killed += 1 # So the room levels up like a local game
+                for other in self.players.values():
+                    other.matcher.remove(word)
+                player.matcher.clear()
+                player.score += len(word)
+                self.scores[player.name] = player.score
+                self.lines.append("K {} {}".format(word, player.id))
+                self.lines.append("P {} {}".format(player.id, player.score))
+
+    def step(self):
+        """ Moves the race one tick forward, and sends what happened to everybody """
+        health = self.state.health
+        lines = ["T {} {:.6f}".format(self.tick, time.time())] + self.lines
+        self.lines = []
+        self.tick += 1
+
+        for event, value in self.state.step(1. / self.rate):
+            if event == 'spawn':
+                for player in self.players.values():
+                    player.matcher.add(value)
+                x, t, color = self.state.current_words[value]
+                lines.append("S {} {} {:.3f}".format(value, x, t))
+            elif event == 'miss':
+                for player in self.players.values():
+                    player.matcher.remove(value)
+                lines.append("M {}".format(value))
+            elif event == 'level':
+                lines.append("L {}".format(value))
+        if self.state.health != health:
+            lines.append("H {}".format(self.state.health))
+        if self.state.over:
+            lines.append("O")
+
+        self.broadcast(("\n".join(lines) + "\n").encode('ascii'))
+
+    def broadcast(self, data):
+        """ Writes `data` to every player without waiting, players that can't keep up are dropped """
+        for player in list(self.players.values()):
+            transport = player.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > MAX_BUFFER:
+                transport.abort()
+                self.leave(player)
+                continue
+            player.writer.write(data)
+            self.sent += len(data)
+
+    async def run(self):
+        """ Ticks until the race is over or everybody has left """
+        start = time.monotonic()
+        while self.players and not self.state.over:
+            self.step()
+            await asyncio.sleep(max(0, start + self.tick / self.rate - time.monotonic()))
+        for player in list(self.players.values()):
+            player.writer.close()
+
+
+class Server(object):
+    def __init__(self, seed=None, difficulty=0, rate=35):
+        self.rng = random.Random(seed)
+        self.difficulty = difficulty
+        self.rate = rate
+        self.rooms = {} # {name: Room}
+        self.rooms_running = set() # The tasks of the rooms, the event loop only keeps weak references to them
+        self.handlers = set() # The tasks handling the connections
+
+    async def handle(self, reader, writer):
+        room = player = None
+        self.handlers.add(asyncio.current_task())
+        try:
+            line = await reader.readline()
+            parts = line.decode('ascii', 'replace').split()
+            if len(parts) != 3 or parts[0] != "JOIN":
+                writer.write(b"ERROR expected JOIN <room> <name>\n")
+                return
+
+            room = self.rooms.get(parts[1])
+            if room is None:
+                room = self.rooms[parts[1]] = Room(parts[1], self.rng.getrandbits(32), self.difficulty, self.rate)
+                task = asyncio.ensure_future(self.run_room(room))
+                self.rooms_running.add(task)
+                task.add_done_callback(self.room_done)
+            player = room.join(parts[2], writer)
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                room.press(player, line.rstrip(b"\n").decode('ascii', 'replace'))
+        except (ConnectionError, ValueError): # ValueError: a line longer than the limit of the reader
+            pass
+        finally:
+            if player is not None:
+                room.leave(player)
+            writer.close()
+            self.handlers.discard(asyncio.current_task())
+
+    def room_done(self, task):
+        self.rooms_running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            exception = task.exception()
+            print("A room failed:")
+            traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+    async def close(self):
+        """ Stops the rooms that are still running, and waits for their connections to be closed """
+        for task in self.rooms_running:
+            task.cancel()
+        await asyncio.gather(*self.rooms_running, return_exceptions=True)
+        for room in self.rooms.values():
+            for player in room.players.values():
+                player.writer.transport.abort() # The handler reads the end of the stream and returns
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    async def run_room(self, room):
+        print("Room {} started".format(room.name))
+        started = time.monotonic()
+        await room.run()
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+        seconds = time.monotonic() - started
+        best = sorted(room.scores.items(), key=lambda item: -item[1])[:3]
+        print("Room {} ended after {} ticks ({:.0f} s): {} keystrokes, {:.0f} kB/s sent, best {}".format(
+            room.name, room.tick, seconds, room.keystrokes, room.sent / 1000. / max(seconds, 1e-9),
+            ", ".join("{} {}".format(name, score) for name, score in best) or "-"))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Host typing races over TCP")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on, 0.0.0.0 for the LAN")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--difficulty', type=int, default=0, choices=(0, 1, 3))
+    parser.add_argument('--rate', type=int, default=35, help="ticks per second (default: %(default)s)")
+    parser.add_argument('--seed', type=int, help="seeds the seeds of the rooms")
+    args = parser.parse_args()
+
+    server = Server(args.seed, args.difficulty, args.rate)
+
+    async def main():
+        listener = await asyncio.start_server(server.handle, args.host, args.port, backlog=1024)
+        print("Listening on {}:{}".format(args.host, args.port))
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,54 @@
+from engine import GameState, TypistBot, simulate, BACKSPACE
+
+
+def play(seed):
+    state = GameState(seed=seed)
+    bot = TypistBot(cps=6, seed=seed)
+    log = []
+    while state.time < 120 and not state.over:
+        keystrokes = bot.keystrokes(state, 1/35.)
+        log.append((keystrokes, list(state.step(1/35., keystrokes))))
+    return state, log
+
+
+def test_same_seed_same_game():
+    first, first_log = play(4)
+    second, second_log = play(4)
+    assert first_log == second_log
+    assert (first.score, first.health, first.words_killed) == (second.score, second.health, second.words_killed)
+    assert first.words_killed > 0
+
+    other, other_log = play(5)
+    assert other_log != first_log
+
+
+def test_completed_word_is_killed():
+    state = GameState(seed=1)
+    state.step(1/35.)
+    word = next(iter(state.current_words))
+
+    events = state.step(1/35., list(word[:-1]) + ['x', BACKSPACE, word[-1]])
+    assert ('kill', word) in events
+    assert word not in state.current_words
+    assert state.score == len(word)
+    assert state.words_killed == 1
+    assert state.prompt_content == ''
+
+
+def test_miss_costs_health():
+    state = GameState(seed=1)
+    state.step(1/35.)
+    word = next(iter(state.current_words))
+
+    events = []
+    while ('miss', word) not in events:
+        events = state.step(1/35.)
+    assert state.health == state.max_health - 1
+    assert word not in state.current_words
+
+
+def test_game_ends_without_health():
+    state = simulate(GameState(seed=2), TypistBot(cps=0), 3600)
+    assert state.over
+    assert state.health <= 0
+    assert state.step(1/35., ['a']) == []
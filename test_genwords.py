@@ -0,0 +1,79 @@
+import random
+
+import genwords
+from genwords import DistinctSample
+
+
+def zipf_corpus(path, tokens, vocabulary, seed=1):
+    """ Writes `tokens` words drawn from `vocabulary` distinct ones, the n-th one with weight 1/n """
+    rng = random.Random(seed)
+    words = ["w{}".format(i) for i in range(vocabulary)]
+    weights = [1. / (i+1) for i in range(vocabulary)]
+    picked = rng.choices(words, weights, k=tokens)
+    path.write_text(u" ".join(picked)) # All on one line
+    return set(picked)
+
+
+def test_samples_distinct_words_of_a_skewed_corpus(tmp_path):
+    path = tmp_path / "corpus.txt"
+    distinct = zipf_corpus(path, 50000, 2000)
+    words = genwords.build([str(path)], size=500, seed=1)
+    picked = set(word for ws in words.values() for word in ws)
+    assert len(picked) == 500
+    assert picked <= distinct
+
+
+def test_frequent_words_are_not_favoured():
+    picked = 0
+    trials = 400
+    for trial in range(trials):
+        sample = DistinctSample(10, str(trial).encode('ascii'))
+        for i in range(1000):
+            sample.add("common")
+        for i in range(99):
+            sample.add("rare{}".format(i))
+        picked += "common" in sample.items
+    assert 0.05 < picked / float(trials) < 0.16 # 10 of the 100 distinct words are picked
+
+
+def test_merged_samples_equal_one_sample_of_everything():
+    rng = random.Random(3)
+    words = ["".join(rng.choice("abcdef") for i in range(rng.randint(2, 6))) for j in range(3000)]
+    whole = DistinctSample(50, b"key")
+    parts = [DistinctSample(50, b"key") for i in range(4)]
+    for i, word in enumerate(words):
+        whole.add(word)
+        parts[i % 4].add(word)
+    merged = DistinctSample(50, b"key")
+    for part in parts:
+        merged.merge(part)
+    assert merged.items == whole.items
+
+
+def test_read_words_in_blocks_and_chunks(tmp_path):
+    rng = random.Random(4)
+    text = " ".join("".join(rng.choice("xyz") for i in range(rng.randint(1, 9))) for j in range(2000))
+    text = text.replace(" ", "\n", 50).replace(" ", "  \t", 50)
+    path = tmp_path / "corpus.txt"
+    path.write_text(text)
+
+    assert list(genwords.read_words(str(path), blocksize=7)) == text.split()
+    for count in (1, 2, 3, 16):
+        chunked = [word for start, end in genwords.chunks(str(path), count)
+                   for word in genwords.read_words(str(path), start, end, blocksize=5)]
+        assert chunked == text.split()
+
+
+def test_overlong_words_are_skipped(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text(u"short " + u"x" * 5000 + u" after\nlast")
+    assert list(genwords.read_words(str(path), blocksize=64, longest=100)) == ["short", "after", "last"]
+
+
+def test_chunks_sampled_in_processes_give_the_same_words(tmp_path):
+    path = tmp_path / "corpus.txt"
+    zipf_corpus(path, 20000, 3000)
+    alone = genwords.build([str(path)], per_length=20, seed=2)
+    split = genwords.build([str(path)], per_length=20, seed=2, processes=3)
+    assert alone == split
+    assert all(len(ws) == 20 for length, ws in alone.items() if length > 2)
@@ -0,0 +1,31 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame as pg
+
+import game
+import scores
+
+
+def test_highscore_is_rebuilt_after_a_game(tmp_path, monkeypatch):
+    monkeypatch.setattr(scores, 'store', scores.ScoreStore(str(tmp_path / "highscores")))
+
+    class FakeGame(object):
+        def __init__(self, size, **options):
+            pass
+
+        def main(self, screen):
+            scores.write_score(999, 0)
+
+    monkeypatch.setattr(game, 'Game', FakeGame)
+    screen = pg.Surface((game.WIDTH, game.HEIGHT))
+    menu = game.Menu()
+    menu.highscoresurf = before = menu.construct_highscoresurf()
+    menu.full_redraw = False
+
+    menu.play(screen, difficulty=0)
+
+    assert menu.full_redraw
+    assert pg.image.tostring(menu.highscoresurf, 'RGBA') != pg.image.tostring(before, 'RGBA')
+    assert pg.image.tostring(menu.highscoresurf, 'RGBA') == pg.image.tostring(menu.construct_highscoresurf(), 'RGBA')
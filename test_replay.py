@@ -0,0 +1,69 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame as pg
+
+from engine import GameState, TypistBot
+from replay import Recorder, Replay
+
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "game.rec")
+    state = GameState(1, seed=5)
+    recorder = Recorder(path, 5, 1, 120, immediate_input=True, swarm=3, buffersize=16)
+    frames = [(28, []), (29, ['a', 'b', '\x08']), (70000, ['Z'])]
+    for ms, keystrokes in frames:
+        recorder.frame(ms, keystrokes)
+    state.score, state.health, state.words_killed = 12, 4, 3
+    recorder.close(state)
+
+    recording = Replay(path)
+    assert recording.game_options() == dict(difficulty=1, seed=5, logic_rate=120, immediate_input=True, swarm=3)
+    assert recording.frames == [(28, []), (29, ['a', 'b', '\x08']), (0xFFFE, ['Z'])]
+    assert recording.result == (12, 4, 3)
+
+
+def record_game(tmp_path, monkeypatch):
+    """ Records a game a bot plays, returns the path of the recording and the Game """
+    import game
+    import scores
+    monkeypatch.setattr(scores, 'store', scores.ScoreStore(str(tmp_path / "highscores")))
+    screen = pg.display.set_mode((game.WIDTH, game.HEIGHT))
+    path = str(tmp_path / "game.rec")
+
+    recorded = game.Game(screen.get_size(), seed=3, record=path)
+    bot = TypistBot(cps=8, seed=3)
+    keystrokes = []
+    for frame in range(400):
+        ms = (28, 29, 30)[frame % 3]
+        keystrokes += bot.keystrokes(recorded.state, ms / 1000.)
+        recorded.recorder.frame(ms, keystrokes)
+        if recorded.update(ms / 1000., keystrokes):
+            keystrokes = []
+    recorded.end()
+    assert recorded.state.words_killed > 0
+    return path, recorded
+
+
+def test_replayed_game_ends_like_the_recorded_one(tmp_path, monkeypatch):
+    import game
+    path, recorded = record_game(tmp_path, monkeypatch)
+    screen = pg.display.get_surface()
+
+    recording = Replay(path)
+    replayed = game.Game(screen.get_size(), **recording.game_options())
+    assert replayed.replay(screen, recording, realtime=False)
+    assert (replayed.state.score, replayed.state.words_killed) == (recorded.state.score, recorded.state.words_killed)
+
+
+def test_replay_with_profile(tmp_path, monkeypatch):
+    import game
+    path, recorded = record_game(tmp_path, monkeypatch)
+    screen = pg.display.get_surface()
+    csvpath = tmp_path / "profile.csv"
+
+    recording = Replay(path)
+    replayed = game.Game(screen.get_size(), profile=str(csvpath), **recording.game_options())
+    assert replayed.replay(screen, recording, realtime=False)
+    assert len(csvpath.read_text().splitlines()) == 1 + len(recording.frames) # The header and every frame
@@ -0,0 +1,47 @@
+from scores import ScoreStore
+
+
+def test_best_and_top_scores(tmp_path):
+    store = ScoreStore(str(tmp_path / "highscores"), keep=3)
+    assert store.best() == 0
+    for score, difficulty in [(10, 0), (30, 0), (20, 1), (5, 0), (40, 0), (25, 0)]:
+        store.write(score, difficulty)
+
+    assert store.best() == 40
+    assert store.best(0) == 40
+    assert store.best(1) == 20
+    assert store.best(3) == 0
+    assert [score for score, timestamp in store.top_scores(0)] == [40, 30, 25]
+
+
+def test_sees_what_others_write(tmp_path):
+    path = str(tmp_path / "highscores")
+    ours, theirs = ScoreStore(path), ScoreStore(path)
+    ours.write(10, 0)
+    theirs.write(99, 0)
+    assert ours.best(0) == 99
+
+
+def test_old_entries_without_difficulty(tmp_path):
+    path = tmp_path / "highscores"
+    path.write_text(u"17\n\nnot a score\n3 1 1000\n")
+    store = ScoreStore(str(path))
+    assert store.best() == 17
+    assert store.best(None) == 17
+    assert store.best(1) == 3
+
+
+def test_compaction_keeps_the_top_scores(tmp_path):
+    path = tmp_path / "highscores"
+    store = ScoreStore(str(path), keep=2, compact_factor=2)
+    for score in range(1, 30):
+        store.write(score, score % 2)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) <= 2 * 2 * 2 # keep * difficulties * compact_factor
+    assert store.best(0) == 28 and store.best(1) == 29
+    assert [score for score, timestamp in store.top_scores(1)] == [29, 27]
+
+    reread = ScoreStore(str(path), keep=2)
+    assert reread.top_scores(0) == store.top_scores(0)
+    assert reread.top_scores(1) == store.top_scores(1)
@@ -0,0 +1,54 @@
+import random
+
+from trie import PrefixMatcher
+
+
+def linear(words, prompt):
+    """ What the matcher should answer, found by going through all the words """
+    typed = set(word for word in words if prompt and word.startswith(prompt))
+    return dict(valid=any(word.startswith(prompt) for word in words),
+                completed=prompt if prompt in words else None,
+                typed=typed,
+                target=next(iter(typed)) if len(typed) == 1 else None)
+
+
+def test_matches_a_linear_scan():
+    rng = random.Random(1)
+    vocabulary = ["".join(rng.choice("abc") for i in range(rng.randint(1, 5))) for j in range(60)]
+    matcher = PrefixMatcher()
+    words = set()
+    for step in range(5000):
+        action = rng.random()
+        if action < 0.15:
+            word = rng.choice(vocabulary)
+            if word not in words:
+                words.add(word)
+                matcher.add(word)
+        elif action < 0.25 and words:
+            word = rng.choice(sorted(words))
+            words.remove(word)
+            matcher.remove(word)
+        elif action < 0.7:
+            matcher.type(rng.choice("abcd"))
+        elif action < 0.95:
+            matcher.backspace()
+        else:
+            matcher.clear()
+
+        expected = linear(words, matcher.prompt)
+        assert matcher.valid == expected['valid']
+        assert matcher.completed == expected['completed']
+        assert matcher.typed_words() == expected['typed']
+        assert matcher.target == expected['target']
+
+
+def test_words_given_to_the_constructor():
+    matcher = PrefixMatcher(["fly", "flow", "ant"])
+    for char in "fl":
+        matcher.type(char)
+    assert matcher.typed_words() == set(["fly", "flow"])
+    assert matcher.target is None
+    matcher.type("o")
+    assert matcher.target == "flow"
+    matcher.type("w")
+    assert matcher.completed == "flow"
@@ -0,0 +1,53 @@
+import hashlib
+import random
+
+import wordindex
+
+# (number of words, sha1 of the sorted words joined by spaces) of every length in the words.py that
+# words.idx replaced
+WORDS_PY = {2: (5, '8995cb2523e4'), 3: (14, '70814ebb109e'), 4: (58, '56cd1a66beb0'), 5: (124, '831822e2b0b0'),
+            6: (157, 'ee5cd6386e15'), 7: (199, '6c6ec449b2e3'), 8: (208, '3e5ab2f23a1e'), 9: (194, 'f56f466fcb1a'),
+            10: (150, 'cb7e5e4ccd70'), 11: (82, 'fc0e2ff3349c'), 12: (56, '51aa075f7860'), 13: (29, 'a9a345beebe1'),
+            14: (11, 'bd7e32ba3bc6'), 15: (9, 'a8e0294dad87'), 16: (3, '59f8b1a96da3'), 19: (1, '073511c7f61c')}
+
+
+def fingerprint(index):
+    return dict((length, (len(index.bucket(length)),
+                          hashlib.sha1(" ".join(index.bucket(length)).encode('ascii')).hexdigest()[:12]))
+                for length in index.lengths())
+
+
+def test_shipped_index_has_the_words_of_words_py():
+    assert fingerprint(wordindex.WordIndex()) == WORDS_PY
+
+
+def test_write_and_read_back(tmp_path):
+    words = {3: set(["fly", "ant", "bee"]), 5: set(["apple"]), 7: set()}
+    path = str(tmp_path / "words.idx")
+    wordindex.write(path, words)
+
+    index = wordindex.WordIndex(path)
+    assert index.lengths() == [3, 5]
+    assert list(index.bucket(3)) == ["ant", "bee", "fly"]
+    assert index.bucket(3)[-1] == "fly"
+    assert list(index.bucket(5)) == ["apple"]
+    assert index.bucket(4) is None
+
+
+def test_level_words():
+    words = wordindex.LevelWords(wordindex.WordIndex())
+    words.unlock([2, 3, 4])
+    words.unlock([3]) # Already unlocked, nothing changes
+
+    expected = [word for length in (2, 3, 4) for word in wordindex.WordIndex().bucket(length)]
+    assert len(words) == len(expected)
+    assert [words[i] for i in range(len(words))] == expected
+    assert words[-1] == expected[-1]
+
+    assert sum(words.first_counts.values()) == len(expected)
+    assert words.first_characters == set(word[0] for word in expected)
+    rng = random.Random(1)
+    for first_character in sorted(words.first_characters):
+        for i in range(20):
+            word = words.random_word(first_character, rng)
+            assert word.startswith(first_character) and word in expected
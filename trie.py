@@ -0,0 +1,113 @@
+""" Incremental matching of the prompt against the current words """
+
+
+class Node(object):
+    __slots__ = ('children', 'count', 'word')
+
+    def __init__(self):
+        self.children = dict()
+        self.count = 0 # Number of words that go through this node
+        self.word = None # The word that ends here, if any
+
+
+class PrefixMatcher(object):
+    """ A trie of the current words that follows the content of the prompt.
+
+    ''' self.path holds the nodes of the longest prefix of the prompt that is in the trie, so typing and
+    ''' backspacing only move one step, and adding or removing a word only walks the prompt again.
+    ''' The answers are cached until the next change.
+    """
+    def __init__(self, words=()):
+        self.root = Node()
+        self.prompt = ''
+        self.path = [self.root]
+        self.typed = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node = self.root
+        node.count += 1
+        for char in word:
+            node = node.children.setdefault(char, Node())
+            node.count += 1
+        node.word = word
+        self.walk()
+
+    def remove(self, word):
+        node = self.root
+        node.count -= 1
+        for char in word:
+            child = node.children[char]
+            child.count -= 1
+            if not child.count:
+                del node.children[char]
+            node = child
+        node.word = None
+        self.walk()
+
+    def type(self, char):
+        self.prompt += char
+        if len(self.path) == len(self.prompt):
+            child = self.path[-1].children.get(char)
+            if child is not None:
+                self.path.append(child)
+        self.typed = None
+
+    def backspace(self):
+        self.prompt = self.prompt[:-1]
+        del self.path[len(self.prompt)+1:]
+        self.typed = None
+
+    def clear(self):
+        self.prompt = ''
+        self.path = [self.root]
+        self.typed = None
+
+    def walk(self):
+        """ Finds the path of the prompt from the root again, after the trie has changed """
+        self.path = [self.root]
+        for char in self.prompt:
+            child = self.path[-1].children.get(char)
+            if child is None:
+                break
+            self.path.append(child)
+        self.typed = None
+
+    @property
+    def node(self):
+        """ The node of the whole prompt, or None if no word starts with it """
+        return self.path[-1] if len(self.path) == len(self.prompt)+1 and self.path[-1].count else None
+
+    @property
+    def valid(self):
+        """ Whether the prompt is the beginning of any of the words """
+        return self.node is not None
+
+    @property
+    def completed(self):
+        """ The word that is equal to the prompt, if any """
+        node = self.node
+        return node.word if node is not None else None
+
+    def typed_words(self):
+        """ The set of words that start with the (non-empty) prompt """
+        if self.typed is None:
+            self.typed = set()
+            node = self.node
+            if self.prompt and node is not None:
+                stack = [node]
+                while stack:
+                    node = stack.pop()
+                    if node.word is not None:
+                        self.typed.add(node.word)
+                    stack.extend(node.children.values())
+        return self.typed
+
+    @property
+    def target(self):
+        """ The word being typed, if the prompt only fits one word """
+        node = self.node
+        if node is None or node.count != 1 or not self.prompt:
+            return None
+        return next(iter(self.typed_words()))
@@ -0,0 +1,157 @@
+""" A compact on-disk index of the words of the game, grouped by length.
+
+''' The file starts with a header and a table with one (length, offset, count) entry per word length,
+''' followed by the words themselves. All the words of a length are stored back to back without
+''' separators, sorted, so the n-th word of a length is found by slicing the file directly. The file is
+''' memory-mapped the first time it's used, and nothing is decoded until a word is picked.
+"""
+
+from collections import defaultdict
+import bisect
+import struct
+import mmap
+import os
+
+indexfile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.idx")
+
+MAGIC = b"MTWI"
+header = struct.Struct("<4sI") # magic, number of lengths
+entry = struct.Struct("<III") # word length, offset of the first word, number of words
+
+
+class WordBucket(object):
+    """ The sorted words of one length, a read-only sequence backed by the mapped file """
+    def __init__(self, data, length, offset, count):
+        self.data = data
+        self.length = length
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = self.offset + i*self.length
+        return self.data[start:start+self.length].decode('ascii')
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+class WordIndex(object):
+    def __init__(self, path=indexfile):
+        self.path = path
+        self.buckets = None # {length: WordBucket}, read when first needed
+
+    def load(self):
+        with open(self.path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, lengths = header.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("{} isn't a word index".format(self.path))
+
+        self.buckets = dict()
+        for i in range(lengths):
+            length, offset, count = entry.unpack_from(data, header.size + i*entry.size)
+            self.buckets[length] = WordBucket(data, length, offset, count)
+
+    def bucket(self, length):
+        """ Returns the words of `length`, or None if there are none """
+        if self.buckets is None:
+            self.load()
+        return self.buckets.get(length)
+
+    def lengths(self):
+        if self.buckets is None:
+            self.load()
+        return sorted(self.buckets)
+
+
+def write(path, words):
+    """ Writes `words`, a dict that looks like {word_length: set_of_words}, as an index to `path` """
+    buckets = [(length, sorted(w.encode('ascii') for w in ws)) for length, ws in sorted(words.items()) if ws]
+
+    offset = header.size + entry.size*len(buckets)
+    table = []
+    for length, ws in buckets:
+        table.append(entry.pack(length, offset, len(ws)))
+        offset += length*len(ws)
+
+    tmp = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp, 'wb') as file:
+        file.write(header.pack(MAGIC, len(buckets)))
+        file.write(b"".join(table))
+        for length, ws in buckets:
+            file.write(b"".join(ws))
+
+    if os.name == "nt" and os.path.exists(path): # os.rename can't replace files on windows
+        os.remove(path)
+    os.rename(tmp, path)
+
+
+class LevelWords(object):
+    """ The words that can be picked at the current level, a read-only sequence (so random.choice works).
+
+    ''' Unlocking a word length appends its bucket from the index, nothing that is already
+    ''' unlocked is touched again. The words are also indexed by their first character: since the
+    ''' buckets are sorted, the words of a bucket that start with the same character are a
+    ''' contiguous range, which is found with a binary search.
+    """
+    def __init__(self, index):
+        self.index = index
+        self.buckets = []
+        self.ends = [] # ends[i] is the number of words in buckets[:i+1]
+        self.lengths = set()
+        self.first_characters = set()
+        self.first_counts = defaultdict(int) # {first character: number of words}
+        self.first_ranges = defaultdict(list) # {first character: [(bucket, start, end), ...]}
+
+    def unlock(self, lengths):
+        for length in lengths:
+            if length in self.lengths:
+                continue
+            self.lengths.add(length)
+
+            bucket = self.index.bucket(length)
+            if bucket:
+                self.buckets.append(bucket)
+                self.ends.append(len(self) + len(bucket))
+                self.index_first_characters(bucket)
+
+    def index_first_characters(self, bucket):
+        start = 0
+        while start < len(bucket):
+            first_character = bucket[start][0]
+            end = bisect.bisect_left(bucket, chr(ord(first_character)+1), start)
+            self.first_characters.add(first_character)
+            self.first_counts[first_character] += end - start
+            self.first_ranges[first_character].append((bucket, start, end))
+            start = end
+
+    def random_word(self, first_character, rng):
+        """ Returns a random unlocked word that starts with `first_character`, using the Random instance `rng` """
+        pick = rng.randrange(self.first_counts[first_character])
+        for bucket, start, end in self.first_ranges[first_character]:
+            if pick < end - start:
+                return bucket[start + pick]
+            pick -= end - start
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        b = bisect.bisect_right(self.ends, i)
+        return self.buckets[b][i - (self.ends[b-1] if b else 0)]
+
+
+index = WordIndex()
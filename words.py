@@ -1 +0,0 @@
-words = {2: set(['sc', 'ye', 'ge', 'tm', 'ma']), 3: set(['fly', 'ito', 'mar', 'ads', 'nib', 'ill', 'rye', 'sad', 'kay', 'ian', 'fan', 'soy', 'lox', 'guy']), 4: set(['gwen', 'lang', 'cusp', 'alba', 'slaw', 'slim', 'eris', 'sled', 'cray', 'coop', 'bork', 'pond', 'boas', 'moll', 'conk', 'blue', 'what', 'said', 'mull', 'odes', 'nook', 'seas', 'calm', 'wags', 'oils', 'hove', 'prof', 'bout', 'must', 'dogs', 'hope', 'sops', 'cary', 'fade', 'zest', 'pull', 'tact', 'bang', 'yuri', 'drab', 'sony', 'bani', 'fort', 'town', 'buck', 'gust', 'omit', 'flow', 'ryan', 'goat', 'mont', 'olav', 'ashy', 'alms', 'russ', 'caws', 'arno', 'yips']), 5: set(['lorna', 'myrna', 'saver', 'probe', 'datum', 'slime', 'fifty', 'cedes', 'tisha', 'rover', 'samba', 'upton', 'trina', 'under', 'tonia', 'aston', 'gnaws', 'lucks', 'yells', 'lunch', 'stout', 'angus', 'deify', 'plush', 'kauai', 'surat', 'venus', 'crams', 'creek', 'bimbo', 'sivan', 'leers', 'copra', 'heine', 'piper', 'debra', 'crush', 'uvula', 'aeons', 'inert', 'punch', 'pedro', 'pasta', 'stage', 'opium', 'tapes', 'rests', 'shush', 'tumor', 'hafiz', 'jello', 'finds', 'blown', 'chimp', 'madge', 'bungs', 'sepoy', 'soapy', 'weepy', 'exalt', 'waned', 'flunk', 'erect', 'fight', 'emacs', 'rhoda', 'aries', 'humus', 'spicy', 'knoll', 'award', 'loony', 'fuzed', 'kraft', 'misty', 'kasai', 'loews', 'homey', 'erica', 'macro', 'pekoe', 'diked', 'drops', 'proof', 'defer', 'canoe', 'penny', 'honed', 'sitar', 'moors', 'edgar', 'heels', 'cacao', 'odors', 'addle', 'odder', 'funny', 'gaped', 'joann', 'shuts', 'rilke', 'nests', 'syncs', 'cline', 'finch', 'reyes', 'depot', 'fidel', 'rimes', 'tides', 'teeth', 'miffs', 'chirp', 'mouth', 'herzl', 'maria', 'sumac', 'aisha', 'cheek', 'ketch', 'curie', 'ascot', 'green', 'xenon']), 6: set(['inning', 'rusted', 'theron', 'lemons', 'cussed', 'doodad', 'hopper', 'obtain', 'erebus', 'grinch', 'fennel', 'cowing', 'gladly', 'subtle', 'prated', 'jarred', 'curses', 'cameos', 'nobler', 'trauma', 'easter', 'carole', 'finger', 'coffee', 'lusher', 'wished', 'lasses', 'nomads', 'toured', 'wavers', 'gloomy', 'tabriz', 'shared', 'groped', 'hominy', 'fields', 'cloudy', 'retrod', 'crotch', 'clutch', 'redraw', 'opting', 'tooled', 'swaths', 'cicada', 'roamed', 'escape', 'atonal', 'danube', 'lesson', 'packed', 'closes', 'unripe', 'fables', 'isidro', 'dipole', 'jiggle', 'droves', 'hookey', 'updike', 'inject', 'freaks', 'nicest', 'legate', 'moaned', 'reffed', 'mazama', 'mccray', 'kelsey', 'niamey', 'deceit', 'notary', 'valium', 'sperry', 'wagged', 'swarms', 'mithra', 'ingest', 'puffin', 'enkidu', 'volley', 'shrank', 'copper', 'heeled', 'osiers', 'clause', 'venues', 'crosby', 'lawful', 'demote', 'cynics', 'equips', 'fabric', 'carina', 'kidder', 'haggle', 'chintz', 'ferris', 'fulled', 'grated', 'toughs', 'biopsy', 'girder', 'kolyma', 'reeked', 'spited', 'belays', 'joshes', 'cloned', 'mutely', 'visual', 'copeck', 'savior', 'remote', 'baying', 'subbed', 'friday', 'comics', 'girdle', 'bahama', 'signed', 'encase', 'aztecs', 'reword', 'ushers', 'twists', 'forced', 'intact', 'pester', 'beside', 'gourds', 'hoopla', 'online', 'plates', 'suites', 'tarter', 'shames', 'blamer', 'yunnan', 'canker', 'mutter', 'modest', 'tinier', 'letter', 'sandra', 'ickier', 'infirm', 'expend', 'alumna', 'soviet', 'beamed', 'bathed', 'amends', 'hailed', 'classy', 'sasses', 'purged']), 7: set(['hijacks', 'bereave', 'lexical', 'partial', 'shorten', 'hatting', 'hectare', 'wakeful', 'aphelia', 'rusting', 'tancred', 'brenton', 'arrears', 'porcine', 'stalest', 'friable', 'darkest', 'chengdu', 'riffing', 'creamed', 'babyish', 'clammed', 'backers', 'mindoro', 'pipping', 'leticia', 'batched', 'balsams', 'listing', 'carmine', 'burring', 'royally', 'catarrh', 'finance', 'heehaws', 'lambert', 'bayonne', 'overall', 'celesta', 'ernesto', 'shading', 'wheaten', 'bawdily', 'tankful', 'chekhov', 'waltzes', 'workman', 'concave', 'commons', 'corinth', 'damning', 'cuspids', 'plopped', 'quickie', 'peppier', 'cronies', 'leveler', 'unaware', 'methane', 'saddled', 'inserts', 'rippers', 'jangled', 'dustbin', 'bitumen', 'hanging', 'miscall', 'asquith', 'edition', 'conakry', 'scraped', 'braided', 'emerges', 'crewing', 'bedsore', 'rioters', 'manning', 'forlorn', 'excised', 'sitters', 'bearish', 'romanov', 'dimples', 'correct', 'stoutly', 'qiqihar', 'pinhole', 'soothed', 'bulimic', 'sootier', 'loonier', 'centaur', 'vitamin', 'paucity', 'untruth', 'oberlin', 'webster', 'harshly', 'angevin', 'missive', 'coupons', 'barrios', 'baffled', 'flossed', 'compote', 'riddled', 'chassis', 'quinton', 'gleeful', 'matisse', 'massage', 'stewart', 'trainer', 'dustier', 'clinton', 'swopped', 'elegiac', 'dawdles', 'romulus', 'soaping', 'adverbs', 'playtex', 'benares', 'calorie', 'mailman', 'sneezes', 'midland', 'utopias', 'pigmies', 'lingoes', 'overjoy', 'brevity', 'dangers', 'annette', 'selects', 'refuted', 'abutted', 'swarmed', 'jigging', 'cravens', 'bassist', 'rupture', 'mellows', 'kampala', 'elegant', 'bloated', 'ungodly', 'reapply', 'wildest', 'ratchet', 'budgets', 'wastage', 'cracked', 'novella', 'savanna', 'hatreds', 'menelik', 'nominee', 'veiling', 'flocked', 'captors', 'impales', 'couples', 'piquing', 'numbers', 'showers', 'unloads', 'clunker', 'engages', 'manuela', 'swearer', 'ideally', 'rhubarb', 'perform', 'uranium', 'steppes', 'cutback', 'brynner', 'foulest', 'shuttle', 'carvers', 'delbert', 'insulin', 'voyages', 'phoenix', 'circlet', 'ovaries', 'infuses', 'teacups', 'suavest', 'outgrow', 'rosalie', 'largely', 'rescued', 'swashed', 'grandpa', 'tickers', 'octavio', 'reserve']), 8: set(['armagnac', 'saunaing', 'barraged', 'antennas', 'omitting', 'foreseen', 'kneeling', 'detoured', 'coloring', 'strumpet', 'footsies', 'sprinter', 'refinish', 'properer', 'forebode', 'actually', 'joggling', 'brawling', 'stepsons', 'striping', 'heartily', 'hardened', 'politest', 'reformed', 'windbags', 'godzilla', 'legatees', 'tracheae', 'advocate', 'predator', 'skivvied', 'grimiest', 'obtusely', 'oversell', 'railroad', 'soothing', 'lifelong', 'bertrand', 'taichung', 'herrings', 'nauseous', 'unilever', 'rogering', 'gibbeted', 'overgrew', 'craftily', 'nominate', 'reassign', 'nonrigid', 'transept', 'woodshed', 'vestries', 'burrowed', 'croppers', 'windward', 'flypaper', 'ambiance', 'discover', 'grenades', 'compotes', 'nobleman', 'provided', 'literati', 'soakings', 'goggling', 'sombrero', 'childish', 'delaware', 'reinvest', 'grinding', 'orgasmic', 'overcook', 'cortical', 'busybody', 'conclave', 'licences', 'deadbeat', 'bullring', 'bespoken', 'shakeups', 'hogwarts', 'shifting', 'milepost', 'tubeless', 'glossier', 'stipends', 'thornier', 'drowning', 'rearward', 'terraria', 'riffraff', 'unbutton', 'helpmate', 'dribbler', 'vivienne', 'oddballs', 'mentions', 'ranching', 'zionists', 'capitols', 'courting', 'artistry', 'woodenly', 'protests', 'marquita', 'prohibit', 'stultify', 'besought', 'disrupts', 'wariness', 'balances', 'organics', 'windlass', 'brainier', 'maximize', 'kiribati', 'slithery', 'litigant', 'heimlich', 'pulsates', 'ordering', 'question', 'markedly', 'euphoria', 'geoffrey', 'conjures', 'relabels', 'chugging', 'flexible', 'disposes', 'sassiest', 'lowering', 'armoring', 'capetian', 'mushroom', 'droplets', 'becoming', 'subspace', 'antennae', 'repeated', 'macbride', 'snoopier', 'evasions', 'hardness', 'ensnares', 'wrestled', 'tribunal', 'stanford', 'refueled', 'pretence', 'deserves', 'accesses', 'offended', 'stuffier', 'monument', 'accessed', 'elegiacs', 'cherubim', 'clobbers', 'juvenile', 'register', 'provosts', 'flashest', 'splatter', 'seediest', 'drowsier', 'adapting', 'twinning', 'regulate', 'evincing', 'colleens', 'expanses', 'liveried', 'lifeless', 'metallic', 'majority', 'satanism', 'pinafore', 'trefoils', 'detector', 'bitching', 'irishmen', 'millikan', 'explores', 'landmark', 'greedily', 'headrest', 'exacting', 'contends', 'passover', 'beanbags', 'palpable', 'verbenas', 'scratchy', 'vitiated', 'dominica', 'epaulets', 'welshing', 'faustino', 'scranton', 'roasters', 'overcast', 'outhouse', 'gyrating', 'turnpike', 'arboreta', 'probates', 'ticketed']), 9: set(['nitpicked', 'planetary', 'civilizes', 'furnished', 'confabbed', 'downpours', 'contorted', 'coxswains', 'equalling', 'inquiries', 'unitarian', 'greenwich', 'stricture', 'passively', 'carolling', 'aimlessly', 'scuttling', 'roadhouse', 'colluding', 'disputing', 'wolverine', 'cotyledon', 'greenness', 'belonging', 'adornment', 'unplanned', 'undivided', 'contracts', 'continues', 'hardeners', 'pharynges', 'cataclysm', 'raincoats', 'goddesses', 'overstock', 'massively', 'denounced', 'champagne', 'appearing', 'truckload', 'positions', 'evictions', 'telemeter', 'flickered', 'lethargic', 'inscribed', 'balloting', 'melanesia', 'concluded', 'bulldozer', 'parasitic', 'objectors', 'punishing', 'kampuchea', 'seventies', 'glamoured', 'smokeless', 'alejandro', 'sycamores', 'tienanmen', 'giorgione', 'eucalypti', 'ideograph', 'footsteps', 'compounds', 'smirching', 'spokesman', 'crossword', 'catalogue', 'streaking', 'musharraf', 'lavenders', 'undecided', 'footpaths', 'patenting', 'assurance', 'oilcloths', 'travelogs', 'scalawags', 'polyhedra', 'disinfect', 'mentoring', 'impeached', 'ebeneezer', 'novelette', 'shortness', 'seclusive', 'forenames', 'anchorage', 'dwellings', 'contented', 'burroughs', 'storeroom', 'untidiest', 'brutalize', 'stalinist', 'salvation', 'additives', 'dietaries', 'crossbows', 'lifeboats', 'genitives', 'gunsmiths', 'peroxides', 'condillac', 'suspended', 'sequences', 'affronted', 'mammogram', 'ungodlier', 'brandying', 'landscape', 'assyrians', 'hothouses', 'political', 'crossfire', 'slowpokes', 'brainwash', 'analgesia', 'relegates', 'wardrobes', 'recovered', 'chastised', 'forlornly', 'imprisons', 'bernhardt', 'vagabonds', 'guiltiest', 'mentality', 'innkeeper', 'banjoists', 'passersby', 'potholder', 'sustained', 'typewrote', 'misspells', 'pheasants', 'positrons', 'hitchcock', 'toothless', 'quotidian', 'consortia', 'punctured', 'alpheratz', 'voodooism', 'davenport', 'mastodons', 'subnormal', 'saltiness', 'paradises', 'devoutest', 'ethically', 'monkeying', 'circuited', 'saturnine', 'despotism', 'hygienist', 'inspector', 'cenotaphs', 'underdogs', 'confirmed', 'democracy', 'chungking', 'bleachers', 'scholarly', 'animation', 'honeywell', 'conspires', 'redesigns', 'assailing', 'humorless', 'blackhead', 'ointments', 'pseudonym', 'weltering', 'eccentric', 'catapults', 'iterators', 'stockings', 'kibitzing', 'motorcade', 'conveyers', 'bourgeois', 'fossilize', 'frilliest', 'artefacts', 'anthology', 'paraclete', 'mementoes', 'soporific', 'showpiece', 'woodpiles', 'grassland', 'clearance']), 10: set(['houseclean', 'scarceness', 'bewitching', 'firebrands', 'chameleons', 'brutalized', 'sulphurous', 'allowances', 'flashlight', 'protrusion', 'simulating', 'conduction', 'houseplant', 'soliciting', 'skirmished', 'shuddering', 'backbiters', 'internment', 'harvesting', 'prophetess', 'crankcases', 'indicative', 'encircling', 'apolitical', 'inflecting', 'expertness', 'forsythias', 'diphthongs', 'artfulness', 'incendiary', 'admissible', 'actualized', 'unreadiest', 'snowmobile', 'engravings', 'apartments', 'divisional', 'resupplied', 'torricelli', 'starfishes', 'goaltender', 'outgrowths', 'theatrical', 'unoriginal', 'afforested', 'vacationer', 'unsettling', 'infelicity', 'exacerbate', 'tantamount', 'indentures', 'imposingly', 'chemically', 'knockwurst', 'humbugging', 'aboriginal', 'obituaries', 'allergenic', 'directions', 'mozzarella', 'empowering', 'roughhouse', 'geographer', 'napoleonic', 'potbellies', 'storefront', 'shampooing', 'boastfully', 'arrogantly', 'faultiness', 'thankfully', 'naturalize', 'mulberries', 'surceasing', 'commitment', 'indisposed', 'extirpates', 'thromboses', 'initiative', 'affliction', 'traitorous', 'suspenders', 'marvelling', 'manicuring', 'reenacting', 'interlocks', 'forcefully', 'chinchilla', 'aftertaste', 'unrecorded', 'exhaustion', 'versifying', 'hodgepodge', 'dustbuster', 'controller', 'misreading', 'unnumbered', 'postmodern', 'ceremonies', 'blustering', 'detoxified', 'gazillions', 'disavowing', 'maximilian', 'expiration', 'exceptions', 'uniforming', 'peroxiding', 'acclimated', 'accusingly', 'subprogram', 'micrometer', 'childishly', 'bridesmaid', 'immortally', 'apoplectic', 'broadsides', 'primitives', 'incognitos', 'sixteenths', 'containing', 'promenaded', 'chessboard', 'fitzgerald', 'repudiated', 'theocratic', 'chatterers', 'dismissing', 'department', 'conclusion', 'spluttered', 'eulogizing', 'stubborner', 'prepayment', 'technocrat', 'eulogistic', 'carpathian', 'treatments', 'satinwoods', 'rakishness', 'renovation', 'ascendants', 'skinflints', 'reproached', 'preexisted', 'gearwheels', 'wayfarings', 'kneecapped', 'admiringly', 'meatloaves']), 11: set(['aristarchus', 'charioteers', 'deciphering', 'cacophonies', 'mimeographs', 'peppercorns', 'impedimenta', 'exhaustible', 'wildflowers', 'stripteases', 'perspective', 'deprogramed', 'headdresses', 'calvinistic', 'expressions', 'operational', 'accidentals', 'procreative', 'impenitence', 'technically', 'headhunters', 'extroverted', 'familiarize', 'equilibrium', 'apparelling', 'reconnected', 'comradeship', 'soliloquize', 'democracies', 'reevaluated', 'bowdlerizes', 'courthouses', 'wakefulness', 'restraining', 'initialized', 'coordinated', 'employments', 'emancipates', 'telegraphic', 'portability', 'squirreling', 'dissonances', 'description', 'anaesthetic', 'palindromic', 'sweethearts', 'diminishing', 'effectuated', 'breadwinner', 'aggregation', 'aristocrats', 'inseparable', 'conscripted', 'memorialize', 'conservator', 'pussyfooted', 'underwrites', 'enlightened', 'substandard', 'unlikeliest', 'tobogganing', 'parentheses', 'tourniquets', 'furnishings', 'deprecation', 'nincompoops', 'informality', 'outsmarting', 'scientology', 'millionaire', 'rectangular', 'forbearance', 'hesitations', 'individuals', 'simplifying', 'foreshadows', 'portmanteau', 'outreaching', 'nightingale', 'bootleggers', 'communicant', 'philippines']), 12: set(['mademoiselle', 'concurrently', 'professorial', 'successively', 'aristophanes', 'plausibility', 'inexperience', 'preoccupying', 'silverfishes', 'equestrienne', 'subcontracts', 'sledgehammer', 'pettifoggers', 'brotherhoods', 'collocations', 'philatelists', 'prepackaging', 'commemorates', 'phonological', 'corroborates', 'antipathetic', 'groundlessly', 'topographies', 'conquistador', 'circumcision', 'vilification', 'infidelities', 'missionaries', 'recollecting', 'circumstance', 'transcribing', 'deliberating', 'retaliations', 'courageously', 'gladiatorial', 'surfboarding', 'constraining', 'infomercials', 'unionization', 'krishnamurti', 'commissariat', 'misapprehend', 'marseillaise', 'unexpurgated', 'remunerative', 'renegotiates', 'spectroscope', 'conservators', 'mollycoddled', 'codependency', 'ratification', 'definitively', 'gratefulness', 'transitively', 'overproduced', 'expressively']), 13: set(['biophysicists', 'malformations', 'unmentionable', 'unsubstantial', 'humanitarians', 'resplendently', 'butterfingers', 'socioeconomic', 'consecutively', 'overconfident', 'discreditable', 'soliloquizing', 'contemplating', 'distressingly', 'primogeniture', 'dimensionless', 'disagreements', 'administrator', 'complementary', 'counteroffers', 'corespondents', 'recrudescence', 'memorializing', 'prophetically', 'compassionate', 'transplanting', 'decentralizes', 'accoutrements', 'conglomerated']), 14: set(['susceptibility', 'asymmetrically', 'sentimentalism', 'concentrically', 'homogenization', 'particularizes', 'contemplatives', 'unappreciative', 'paleontologist', 'disassociating', 'disarrangement']), 15: set(['instrumentation', 'conglomerations', 'electrification', 'correspondingly', 'intellectualism', 'troubleshooters', 'demonstratively', 'noninterference', 'interconnecting']), 16: set(['internationalism', 'overcompensation', 'circumnavigation']), 19: set(['nonrepresentational'])}
\ No newline at end of file